@@ -1,14 +1,40 @@
 # mt5_bridge_client.py
 import zmq
+import asyncio
+import atexit
+import copy
 import json
+import functools
+import itertools
 import threading
 import time
 import logging
-import random
 import os
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, the command channel then always uses JSON
+    msgpack = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, DataFrames are then built by pandas directly
+    pa = ds = feather = pq = None
+
 # ==============================================================================
 # [Core Library Configuration] - Defines the config file path required by the API client itself
 # ==============================================================================
@@ -16,7 +42,251 @@ CONFIG_DIR = "config"
 CONFIG_FILE_NAME = "MT5RemoteBridgeAPI_client_config.json"
 # [New] TOFU trust cache filename
 TRUST_CACHE_FILENAME = "server_trust_cache.json"
+# Persistent CURVE key pair of this client, stored next to the trust cache (mode 0o600)
+CLIENT_KEY_FILENAME = "client_curve_keys.json"
+# Topic prefix of tick messages published by the server
+TICK_TOPIC_PREFIX = "TICK."
+_TICK_TOPIC_PREFIX_BYTES = TICK_TOPIC_PREFIX.encode("utf-8")
+_HEARTBEAT_TOPIC_BYTES = b"HEARTBEAT"
+# Receive high-water mark of the SUB socket, large enough to absorb tick bursts
+SUB_RCVHWM = 100000
+# Maximum number of symbols carried by a single subscribe/unsubscribe request
+SUBSCRIPTION_CHUNK_SIZE = 256
+# Seconds a get_price reply is reused for back-to-back reads of the same symbol, if the "price_cache"
+# client config key is enabled (off by default, so every read measures a real round-trip)
+PRICE_CACHE_TTL_S = 0.25
+# Bounded retry with exponential backoff (see _with_retry): a failed attempt is re-sent after
+# RETRY_BASE_DELAY_S, 2 * RETRY_BASE_DELAY_S, ... until RETRY_MAX_ATTEMPTS is reached
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY_S = 0.05
+# Transport failures (ZMQ error, request timeout) after which a read-only request is retried. Trading requests
+# are never retried: an order that failed in transit may still have reached the server and been filled.
+RETRY_ERROR_CODES = frozenset({408, 500})
+# Total number of bars kept in the in-memory LRU in front of the parquet cache
+HISTORY_MEMORY_CACHE_MAX_ROWS = 10_000_000
+# Number of known-missing cache file names remembered before the set is cleared and rebuilt by new misses
+HISTORY_MISSING_CACHE_MAX_ENTRIES = 4096
+# Subscribed data is logged through its own logger, which does not propagate to the root logger and is
+# off by default; enable it with the "log_ticks" client config key or enable_tick_logging()
+TICK_LOGGER_NAME = "mt5_bridge_client.ticks"
+# Sub-directory of the history cache holding the hive-partitioned bar dataset (symbol=/timeframe=/year=)
+HISTORY_DATASET_DIRNAME = "dataset"
+# Covered time ranges per symbol/timeframe; the leading underscore keeps pyarrow from reading it as data
+HISTORY_COVERAGE_FILENAME = "_coverage.json"
+HISTORY_PARTITION_COLUMNS = ["symbol", "timeframe", "year"]
+# Parquet settings of the history cache: zstd compresses bar data far better than the default snappy
+PARQUET_COMPRESSION_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+}
+PARQUET_ROW_GROUP_SIZE = 65536
+# Per-request cache files are Feather v2 (Arrow IPC): LZ4 decompresses much faster than parquet's zstd and
+# the file can be memory-mapped. Parquet stays the format of the long-term partitioned dataset.
+FEATHER_COMPRESSION = "lz4"
+HISTORY_CACHE_SUFFIX = ".feather" if feather is not None else ".parquet"
+# Column dtypes of the bars returned by get_bars; fields not listed here keep the dtype numpy infers
+_BAR_DTYPES = {
+    "time": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "tick_volume": np.int64,
+    "spread": np.int32,
+    "real_volume": np.int64,
+}
+# Same layout as an Arrow schema, used to build bar tables straight from the server's list of dicts
+_BAR_SCHEMA = (
+    pa.schema(
+        [(name, pa.from_numpy_dtype(dtype)) for name, dtype in _BAR_DTYPES.items()]
+    )
+    if pa is not None
+    else None
+)
+_TIMEFRAME_UNIT_SECONDS = {"M": 60, "H": 3600, "D": 86400, "W": 604800, "MN": 2592000}
+# ==============================================================================
+
+
+# ==============================================================================
+# [Serialization] - orjson is used on the hot path when available
+# ==============================================================================
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+else:
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _json_loads(data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    _JSONDecodeError = json.JSONDecodeError
+
+if msgpack is not None:
+
+    def _msgpack_dumps(obj) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def _msgpack_loads(data):
+        return msgpack.unpackb(data, raw=False)
+
+
+# ==============================================================================
+
+
+# ==============================================================================
+# [Config Cache] - The parsed client config is shared by all instances until the file changes
 # ==============================================================================
+@functools.lru_cache(maxsize=8)
+def _load_config_impl(path: str, mtime_ns: int) -> dict:
+    """Parses a config file; keyed by mtime so an edited file is re-read on the next load."""
+    logging.info(f"Loading configuration file from '{path}'...")
+    with open(path, "rb") as f:
+        config = _json_loads(f.read())
+    logging.info("Configuration file loaded successfully.")
+    return config
+
+
+def load_json_config(path: str) -> dict:
+    """
+    Loads a JSON configuration file, parsing it only once per file modification.
+    Returns a deep copy of the cached dict, so callers may modify it freely.
+    Raises FileNotFoundError, or json.JSONDecodeError (orjson's error is a subclass) if the file is malformed.
+    """
+    return copy.deepcopy(_load_config_impl(path, os.stat(path).st_mtime_ns))
+
+
+# ==============================================================================
+
+
+# ==============================================================================
+# [Shared ZMQ Context] - One context (and one set of I/O threads) for all clients in the process
+# ==============================================================================
+ZMQ_IO_THREADS = max(1, min(4, (os.cpu_count() or 2) // 2))
+_GLOBAL_CTX = None
+_GLOBAL_CTX_LOCK = threading.Lock()
+# Suffix for inproc endpoint names. libzmq releases an inproc name asynchronously after its socket is closed,
+# so each connect() binds fresh names instead of reusing the previous connection's.
+_inproc_ids = itertools.count()
+
+
+def _shared_context() -> zmq.Context:
+    """Returns the process-wide zmq.Context, creating it on first use. It is destroyed at interpreter exit."""
+    global _GLOBAL_CTX
+    with _GLOBAL_CTX_LOCK:
+        if _GLOBAL_CTX is None:
+            _GLOBAL_CTX = zmq.Context.instance(io_threads=ZMQ_IO_THREADS)
+            atexit.register(_GLOBAL_CTX.destroy, linger=0)
+        return _GLOBAL_CTX
+
+
+# ==============================================================================
+
+
+def _open_private(path: str):
+    """
+    Opens path for binary writing, truncated, with owner-only (0o600) permissions. The mode given to os.open
+    only applies when the file is created, so an existing file is narrowed explicitly.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)
+        else:
+            os.chmod(path, 0o600)
+    except OSError:
+        os.close(fd)
+        raise
+    return os.fdopen(fd, "wb")
+
+
+def _with_bar_types(schema):
+    """
+    Returns schema with the known bar columns set to their _BAR_SCHEMA types. Other fields keep the type
+    Arrow inferred, like fields outside _BAR_DTYPES do on the numpy path.
+    """
+    return pa.schema(
+        [
+            _BAR_SCHEMA.field(field.name) if field.name in _BAR_DTYPES else field
+            for field in schema
+        ]
+    )
+
+
+def _timeframe_seconds(timeframe: str) -> int:
+    """Returns the bar duration of an MT5 timeframe string such as 'M15', 'H4' or 'MN1'."""
+    unit = "MN" if timeframe.startswith("MN") else timeframe[:1]
+    return _TIMEFRAME_UNIT_SECONDS[unit] * int(timeframe[len(unit) :] or 1)
+
+
+def _missing_ranges(covered: list, start: int, end: int) -> list:
+    """Returns the inclusive [start, end] sub-ranges not covered by the sorted, merged ranges in `covered`."""
+    gaps, cursor = [], start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - 1))
+        cursor = covered_end + 1
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _add_range(covered: list, start: int, end: int):
+    """Inserts the inclusive range [start, end] into `covered`, keeping it sorted and merged."""
+    covered.append([start, end])
+    covered.sort()
+    merged = [covered[0]]
+    for range_start, range_end in covered[1:]:
+        if range_start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    covered[:] = merged
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_time_string(value: str) -> int:
+    """
+    Converts a 'YYYY-MM-DD HH:MM:SS' string to a Unix timestamp. fromisoformat is C-implemented and much
+    faster than strptime; callers tend to repeat the same range strings, so results are memoized as well.
+    """
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+_tick_logger = logging.getLogger(TICK_LOGGER_NAME)
+# Ticks never reach the root logger's handlers; while the level is above INFO the listener skips decoding them
+_tick_logger.propagate = False
+_tick_logger.setLevel(logging.WARNING)
+_tick_logger.addHandler(logging.NullHandler())
+_tick_stream_handler = None
+
+
+def enable_tick_logging(handler: logging.Handler = None, level=logging.INFO):
+    """
+    Turns on logging of subscribed data. The tick logger does not propagate, so its records only go to
+    handler; without one, a process-wide StreamHandler in the tester's format is used. Each handler is attached once.
+    """
+    global _tick_stream_handler
+    if handler is None:
+        if _tick_stream_handler is None:
+            _tick_stream_handler = logging.StreamHandler()
+            _tick_stream_handler.setFormatter(
+                logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+            )
+        handler = _tick_stream_handler
+    if handler not in _tick_logger.handlers:
+        _tick_logger.addHandler(handler)
+    _tick_logger.setLevel(level)
+    return handler
 
 
 class APIClient:
@@ -27,92 +297,196 @@ class APIClient:
     Trust cache file location moved to CONFIG_DIR for persistence.
     """
 
-    def __init__(self, history_cache_dir="history_cache"):
+    def __init__(self, history_cache_dir="history_cache", rotate_keys=False):
         """
         The constructor no longer accepts a configuration dictionary directly, but loads it internally.
+
+        :param rotate_keys: Generate and persist a new CURVE key pair instead of reusing the stored one.
         """
         self.config = self._load_config()
-        self.context = zmq.Context()
+        self._auth_key = self.config["auth_key"]
+        # Request timeout hoisted out of the per-request path (ms for pollers, seconds for futures)
+        self._req_timeout_ms = int(self.config["request_timeout"])
+        self._req_timeout_s = self._req_timeout_ms / 1000.0
+        # Constant leading bytes of every JSON request: '{"auth_key":"...","python_id":"'
+        self._envelope_prefix = (
+            _json_dumps({"auth_key": self._auth_key})[:-1] + b',"python_id":"'
+        )
+        # Encoded bodies of single-field requests, keyed by action
+        self._const_request_bodies = {}
+        # Request IDs come from a counter seeded with the creation time in ms shifted left by 20 bits:
+        # one increment per request, roughly time-ordered across clients, 2^20 IDs per millisecond of headroom
+        self._id_counter = itertools.count(int(time.time() * 1000) << 20)
+        self.context = _shared_context()
+        self._handshake_socket = None
+        self._handshake_poller = None
         self.req_socket = None
+        self._req_poller = None
         self.sub_socket = None
+        self._sub_poller = None
+        # [Subscription] One "TICK." prefix filter on the socket; symbols are filtered client-side
+        self._subscribed_symbols = set()
+        self._tick_filter = frozenset()
+        self._heartbeat_subscribed = False
         self.stop_event = threading.Event()
         self.listener_thread = None
+        self._listener_wake_rx = None
+        self._listener_wake_tx = None
         self.req_lock = threading.Lock()
+        # Command channel codec; switched to msgpack after the handshake if the server supports it
+        self._dumps = _json_dumps
+        self._loads = _json_loads
+
+        # [Ticks] Subscribed data is only logged (and decoded) if the config asks for it
+        if self.config.get("log_ticks", False):
+            enable_tick_logging()
+
+        # [Pipelining] Optional DEALER mode: requests are sent without waiting for the previous reply,
+        # and replies are matched back to their callers' futures by python_id.
+        self.pipelined_requests = bool(self.config.get("pipelined_requests", False))
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._dealer_inbox = None
+        self._dealer_outbox = None
+        self._dealer_thread = None
+        self._dealer_wake_rx = None
+        self._dealer_wake_tx = None
+        # Worker used by async_send in REQ mode. It lives as long as the client, so every suite's event loop
+        # reuses it; one thread suffices because REQ round-trips are serialized by req_lock anyway.
+        self._request_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="request"
+        )
+        # symbol -> (monotonic time, successful get_price reply), see PRICE_CACHE_TTL_S
+        self.price_cache = bool(self.config.get("price_cache", False))
+        self._price_cache = {}
 
         self.server_public_key = None
         self.cmd_endpoint = None
 
         # Cache directory attribute for historical data
         self.history_cache_dir = history_cache_dir
-        if not os.path.exists(self.history_cache_dir):
-            os.makedirs(self.history_cache_dir)
-            logging.info(f"History cache directory created: {self.history_cache_dir}")
+        os.makedirs(self.history_cache_dir, exist_ok=True)
+        self._cache_dir = self.history_cache_dir.rstrip("/\\") or self.history_cache_dir
+        # In-memory LRU of recently loaded DataFrames, keyed by (symbol, timeframe, start_ts, end_ts, count)
+        self._cache_hits = OrderedDict()
+        # Cache files already known not to exist, so repeated misses skip the stat call
+        self._cache_missing = set()
+        self._cache_rows = 0
+        # Guards both structures above, which are shared by caller threads and the cache writer's callback
+        self._history_lock = threading.Lock()
+        # Per-request cache files are written in the background; one worker keeps writes ordered
+        self._cache_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="histcache"
+        )
+        self._history_dataset_dir = f"{self._cache_dir}/{HISTORY_DATASET_DIRNAME}"
+        self._history_coverage = None
 
         # [New V2.1] Define path for the TOFU trust cache file in the config directory.
         self.trust_cache_file = os.path.join(CONFIG_DIR, TRUST_CACHE_FILENAME)
+        # The trusted key is read once; reconnects verify against this in-memory copy
+        self._trusted_server_key = self._load_trusted_server_key()
 
-        logging.info("Generating new temporary key pair for this session...")
-        self.client_public_key, self.client_secret_key = zmq.curve_keypair()
-        logging.info("Temporary key pair generated.")
+        self.client_key_file = os.path.join(CONFIG_DIR, CLIENT_KEY_FILENAME)
+        self.client_public_key, self.client_secret_key = self._load_or_create_keypair(
+            rotate_keys
+        )
+        # The key pair lives for the whole session, so the handshake payload is encoded once and reused on reconnect
+        self._client_public_key_str = self.client_public_key.decode("utf-8")
+        handshake_request = {
+            "action": "request_session_keys",
+            "auth_key": self._auth_key,
+            "client_public_key": self._client_public_key_str,
+        }
+        if msgpack is not None:
+            handshake_request["action_encoding"] = "msgpack"
+        self._handshake_payload = _json_dumps(handshake_request)
 
     def _load_config(self) -> dict:
         """
         Internal method to load the configuration file, implementing self-managed configuration.
         """
         config_path = os.path.join(CONFIG_DIR, CONFIG_FILE_NAME)
-        logging.info(f"Loading core configuration file from '{config_path}'...")
         try:
-            if not os.path.exists(CONFIG_DIR):
-                os.makedirs(CONFIG_DIR)
-                logging.warning(
-                    f"Configuration directory '{CONFIG_DIR}' did not exist and has been created. Please ensure '{config_path}' exists and is configured correctly."
-                )
-
-            with open(config_path, "r") as f:
-                config = json.load(f)
-                logging.info("Core configuration file loaded successfully.")
-                return config
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            return load_json_config(config_path)
         except FileNotFoundError:
             logging.error(f"Fatal Error: Configuration file '{config_path}' not found.")
             raise
-        except json.JSONDecodeError as e:
+        except _JSONDecodeError as e:
             logging.error(
                 f"Fatal Error: Configuration file '{config_path}' is malformed: {e}"
             )
             raise
 
-    def connect(self):
-        logging.info("Starting connection process...")
-        handshake_socket = self.context.socket(zmq.REQ)
-        handshake_socket.linger = 0
-        handshake_endpoint = (
-            f"tcp://{self.config['server_ip']}:{self.config['handshake_port']}"
-        )
-        handshake_socket.connect(handshake_endpoint)
-        logging.info(f"Connected to handshake port: {handshake_endpoint}")
-
-        handshake_request = {
-            "action": "request_session_keys",
-            "auth_key": self.config["auth_key"],
-            "client_public_key": self.client_public_key.decode("utf-8"),
-        }
-        handshake_socket.send_json(handshake_request)
+    def _load_or_create_keypair(self, rotate_keys: bool = False):
+        """
+        Loads the client's CURVE key pair from the config directory, generating and persisting it if missing.
+        Falls back to an ephemeral key pair when the key file cannot be written.
+        """
+        if not rotate_keys:
+            try:
+                with open(self.client_key_file, "rb") as f:
+                    keys = _json_loads(f.read())
+                    if hasattr(os, "fchmod"):
+                        # Key files written by older versions may still be readable by other users
+                        try:
+                            os.fchmod(f.fileno(), 0o600)
+                        except OSError as e:
+                            logging.warning(
+                                f"Cannot restrict permissions of '{self.client_key_file}': {e}"
+                            )
+                logging.info(f"Loaded client key pair from '{self.client_key_file}'.")
+                return (
+                    keys["client_public_key"].encode("utf-8"),
+                    keys["client_secret_key"].encode("utf-8"),
+                )
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(
+                    f"Failed to read client key file '{self.client_key_file}': {e}. Generating a new key pair."
+                )
 
-        poller = zmq.Poller()
-        poller.register(handshake_socket, zmq.POLLIN)
-        if not poller.poll(self.config["request_timeout"]):
-            raise ConnectionError(
-                "Handshake timed out, no response received from server."
+        public_key, secret_key = zmq.curve_keypair()
+        try:
+            with _open_private(self.client_key_file) as f:
+                f.write(
+                    _json_dumps(
+                        {
+                            "client_public_key": public_key.decode("utf-8"),
+                            "client_secret_key": secret_key.decode("utf-8"),
+                        }
+                    )
+                )
+            logging.info(f"New client key pair saved to '{self.client_key_file}'.")
+        except OSError as e:
+            logging.warning(
+                f"Cannot persist client key pair to '{self.client_key_file}': {e}. Using a temporary key pair for this session."
             )
+        return public_key, secret_key
 
+    def connect(self):
+        logging.info("Starting connection process...")
+        handshake_socket = self._get_handshake_socket()
         try:
-            response = handshake_socket.recv_json()
-        except json.JSONDecodeError as e:
+            handshake_socket.send(self._handshake_payload)
+            if not self._handshake_poller.poll(self._req_timeout_ms):
+                # A REQ socket waiting for a reply cannot send again, so it is rebuilt on the next attempt
+                self._reset_handshake_socket()
+                raise ConnectionError(
+                    "Handshake timed out, no response received from server."
+                )
+            raw = handshake_socket.recv(copy=False)
+        except zmq.error.ZMQError as e:
+            self._reset_handshake_socket()
+            raise ConnectionError(f"Handshake failed: {e}")
+
+        try:
+            response = _json_loads(raw.buffer)
+        except _JSONDecodeError as e:
             raise ConnectionError(
                 f"Handshake failed: Could not parse server response. Error: {e}"
             )
-        finally:
-            handshake_socket.close()
 
         if response.get("status") != "success":
             raise ConnectionError(f"Handshake failed: {response.get('message')}")
@@ -122,6 +496,13 @@ class APIClient:
         self._verify_server_identity(server_data)
         # --- End of TOFU Implementation ---
 
+        # [Encoding] Use msgpack on the command channel only if the server acknowledged it
+        if msgpack is not None and server_data.get("action_encoding") == "msgpack":
+            self._dumps, self._loads = _msgpack_dumps, _msgpack_loads
+            logging.info("Server supports msgpack, using it on the command channel.")
+        else:
+            self._dumps, self._loads = _json_dumps, _json_loads
+
         logging.info(
             "Handshake successful and server identity verified. Proceeding to establish secure communication channels."
         )
@@ -131,9 +512,17 @@ class APIClient:
         self.cmd_endpoint = f"tcp://{self.config['server_ip']}:{cmd_port}"
         pub_endpoint = f"tcp://{self.config['server_ip']}:{pub_port}"
 
-        self._connect_req_socket()
+        if self.pipelined_requests:
+            self._connect_dealer_socket()
+        else:
+            self._connect_req_socket()
+        # On a reconnect the previous listener still owns the SUB socket and the wake endpoint
+        self._stop_listener()
         self._connect_sub_socket(pub_endpoint)
 
+        self._listener_wake_rx, self._listener_wake_tx = self._create_wake_pair(
+            "listener"
+        )
         self.listener_thread = threading.Thread(target=self._listen_for_updates)
         self.listener_thread.daemon = True
         self.listener_thread.start()
@@ -141,6 +530,41 @@ class APIClient:
         time.sleep(0.5)
         logging.info("Connection process complete, client is ready.")
 
+    def _get_handshake_socket(self):
+        """Returns the handshake REQ socket, connecting it on first use; it is kept for later reconnects."""
+        if self._handshake_socket is None:
+            handshake_endpoint = (
+                f"tcp://{self.config['server_ip']}:{self.config['handshake_port']}"
+            )
+            self._handshake_socket = self.context.socket(zmq.REQ)
+            self._handshake_socket.linger = 0
+            self._handshake_socket.connect(handshake_endpoint)
+            self._handshake_poller = zmq.Poller()
+            self._handshake_poller.register(self._handshake_socket, zmq.POLLIN)
+            logging.info(f"Connected to handshake port: {handshake_endpoint}")
+        return self._handshake_socket
+
+    def _reset_handshake_socket(self):
+        """Closes the handshake socket so the next connect() starts from a fresh one."""
+        if self._handshake_socket is not None:
+            self._handshake_socket.close()
+        self._handshake_socket = None
+        self._handshake_poller = None
+
+    def _load_trusted_server_key(self):
+        """Reads the TOFU-trusted server public key from the trust cache file, or None if there is none yet."""
+        try:
+            with open(self.trust_cache_file, "rb") as f:
+                return _json_loads(f.read()).get("server_public_key")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(
+                f"Failed to read trust cache file '{self.trust_cache_file}': {e}. "
+                "Will proceed assuming first connection."
+            )
+            return None
+
     def _verify_server_identity(self, server_data: dict):
         """
         Implements Trust On First Use (TOFU) verification.
@@ -156,18 +580,7 @@ class APIClient:
                 "Handshake response did not contain 'server_public_key'."
             )
 
-        trusted_key = None
-        if os.path.exists(self.trust_cache_file):
-            try:
-                with open(self.trust_cache_file, "r") as f:
-                    cache_data = json.load(f)
-                    trusted_key = cache_data.get("server_public_key")
-            except Exception as e:
-                logging.warning(
-                    f"Failed to read trust cache file '{self.trust_cache_file}': {e}. "
-                    "Will proceed assuming first connection."
-                )
-
+        trusted_key = self._trusted_server_key
         if trusted_key:
             # Subsequent connection: Verify key integrity
             if received_key == trusted_key:
@@ -207,8 +620,9 @@ class APIClient:
                     "first_seen_timestamp": datetime.now().isoformat(),
                     "server_ip_at_trust": self.config["server_ip"],
                 }
-                with open(self.trust_cache_file, "w") as f:
-                    json.dump(trust_data, f, indent=4)
+                with _open_private(self.trust_cache_file) as f:
+                    f.write(json.dumps(trust_data, indent=4).encode("utf-8"))
+                self._trusted_server_key = received_key
                 logging.info(
                     f"Server public key cached successfully to: {self.trust_cache_file}"
                 )
@@ -220,6 +634,7 @@ class APIClient:
     def _connect_req_socket(self):
         """Internal method to connect or reconnect the REQ socket"""
         if self.req_socket:
+            self._req_poller.unregister(self.req_socket)
             self.req_socket.close()
         self.req_socket = self.context.socket(zmq.REQ)
         self.req_socket.linger = 0
@@ -227,68 +642,338 @@ class APIClient:
         self.req_socket.curve_publickey = self.client_public_key
         self.req_socket.curve_secretkey = self.client_secret_key
         self.req_socket.connect(self.cmd_endpoint)
+        # The poller is created once and reused by every request
+        if self._req_poller is None:
+            self._req_poller = zmq.Poller()
+        self._req_poller.register(self.req_socket, zmq.POLLIN)
         logging.info(f"Connected to encrypted command port: {self.cmd_endpoint}")
 
+    def _connect_dealer_socket(self):
+        """
+        Internal method to connect the DEALER command socket used in pipelined mode.
+        The socket is owned by a dedicated I/O thread; callers hand their payloads to it over an inproc PUSH/PULL pair.
+        """
+        # On a reconnect the previous I/O thread still owns the inproc endpoints and the old DEALER socket
+        self._stop_dealer()
+        self.req_socket = self.context.socket(zmq.DEALER)
+        self.req_socket.linger = 0
+        self.req_socket.curve_serverkey = self.server_public_key
+        self.req_socket.curve_publickey = self.client_public_key
+        self.req_socket.curve_secretkey = self.client_secret_key
+        self.req_socket.connect(self.cmd_endpoint)
+
+        inproc_endpoint = f"inproc://mt5bridge-dealer-{id(self)}-{next(_inproc_ids)}"
+        self._dealer_inbox = self.context.socket(zmq.PULL)
+        self._dealer_inbox.linger = 0
+        self._dealer_inbox.bind(inproc_endpoint)
+        self._dealer_outbox = self.context.socket(zmq.PUSH)
+        self._dealer_outbox.linger = 0
+        self._dealer_outbox.connect(inproc_endpoint)
+        self._dealer_wake_rx, self._dealer_wake_tx = self._create_wake_pair("dealer")
+
+        self._dealer_thread = threading.Thread(target=self._dealer_io_loop)
+        self._dealer_thread.daemon = True
+        self._dealer_thread.start()
+        logging.info(
+            f"Connected to encrypted command port (pipelined DEALER mode): {self.cmd_endpoint}"
+        )
+
+    def _stop_dealer(self):
+        """
+        Wakes and joins the DEALER I/O thread, then closes its sockets. Requests still in flight on the old
+        socket are not resent; their callers time out.
+        """
+        if self._dealer_thread is None:
+            return
+        self._dealer_wake_tx.send(b"")
+        if self._dealer_thread.is_alive():
+            self._dealer_thread.join(timeout=1)
+        for sock in (
+            self._dealer_outbox,
+            self._dealer_inbox,
+            self._dealer_wake_tx,
+            self._dealer_wake_rx,
+            self.req_socket,
+        ):
+            if sock:
+                sock.close()
+        self._dealer_thread = None
+        self._dealer_outbox = self._dealer_inbox = None
+        self._dealer_wake_rx = self._dealer_wake_tx = None
+        self.req_socket = None
+
+    def _dealer_io_loop(self):
+        """Forwards queued requests to the DEALER socket and dispatches replies to the waiting callers."""
+        poller = zmq.Poller()
+        poller.register(self.req_socket, zmq.POLLIN)
+        poller.register(self._dealer_inbox, zmq.POLLIN)
+        poller.register(self._dealer_wake_rx, zmq.POLLIN)
+        while not self.stop_event.is_set():
+            try:
+                # Block until there is work or close() sends the wake-up signal
+                events = dict(poller.poll())
+                if self._dealer_wake_rx in events:
+                    break
+                if self._dealer_inbox in events:
+                    # The empty delimiter frame keeps the envelope compatible with a REP/ROUTER server
+                    self.req_socket.send_multipart(
+                        [b"", self._dealer_inbox.recv(copy=False)], copy=False
+                    )
+                if self.req_socket in events:
+                    frames = self.req_socket.recv_multipart(copy=False)
+                    self._resolve_pending(self._loads(frames[-1].buffer))
+            except zmq.error.ContextTerminated:
+                break
+            except zmq.error.ZMQError as e:
+                logging.error(f"A ZMQ error occurred in the DEALER I/O thread: {e}")
+            except ValueError as e:
+                logging.error(f"Could not parse a pipelined response: {e}")
+        logging.info("DEALER I/O thread has stopped.")
+
+    def _resolve_pending(self, response: dict):
+        """Hands a pipelined response to the caller waiting on its python_id."""
+        python_id = response.get("python_id")
+        if python_id is None:
+            # Trade error replies (the server's SendOrderErrorResponse) carry the id inside data
+            data = response.get("data")
+            python_id = data.get("python_id") if isinstance(data, dict) else None
+        with self._pending_lock:
+            future = self._pending.pop(python_id, None)
+        if future is None:
+            logging.warning(
+                f"Discarding response with unknown or expired python_id: {python_id}"
+            )
+            return
+        future.set_result(response)
+
+    def _submit_pipelined(self, python_id: str, payload: bytes) -> Future:
+        """Registers a future for python_id and hands the encoded request to the DEALER I/O thread."""
+        future = Future()
+        with self._pending_lock:
+            self._pending[python_id] = future
+        try:
+            # Only the hand-off to the I/O thread is serialized, never the round-trip
+            with self.req_lock:
+                self._dealer_outbox.send(payload, copy=False)
+        except zmq.error.ZMQError:
+            with self._pending_lock:
+                self._pending.pop(python_id, None)
+            raise
+        return future
+
+    def _expire_pipelined(self, python_id: str, action) -> dict:
+        """Drops a timed-out pipelined request; a DEALER has no send/recv state to reset, and a late reply is discarded."""
+        with self._pending_lock:
+            self._pending.pop(python_id, None)
+        logging.warning(f"Request '{action}' timed out.")
+        return {
+            "status": "error",
+            "message": f"Request '{action}' timed out",
+            "error_code": 408,
+        }
+
+    def _send_pipelined_request(
+        self, request: dict, python_id: str, payload: bytes
+    ) -> dict:
+        """Sends a request over the DEALER socket and blocks only this caller until its own reply arrives."""
+        try:
+            start_ns = time.perf_counter_ns()
+            future = self._submit_pipelined(python_id, payload)
+        except zmq.error.ZMQError as e:
+            logging.error(f"A ZMQ error occurred while sending the request: {e}")
+            return {
+                "status": "error",
+                "message": f"ZMQ communication error: {e}",
+                "error_code": 500,
+            }
+        try:
+            response = future.result(self._req_timeout_s)
+        except FutureTimeoutError:
+            return self._expire_pipelined(python_id, request.get("action"))
+        end_to_end_duration = (time.perf_counter_ns() - start_ns) / 1e6
+        response["end_to_end_duration_ms"] = round(end_to_end_duration, 2)
+        return response
+
+    async def async_send(self, request: dict) -> dict:
+        """
+        Awaitable counterpart of _send_request. In pipelined mode concurrent awaits share the DEALER socket,
+        so N independent queries complete in about one round-trip; otherwise the blocking call runs on the
+        client's request worker thread.
+        """
+        if not (self.pipelined_requests and self._dealer_outbox):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._request_executor, self._send_request, request
+            )
+        python_id = self._generate_python_id()
+        payload = self._encode_request(request, python_id)
+        try:
+            start_ns = time.perf_counter_ns()
+            future = asyncio.wrap_future(self._submit_pipelined(python_id, payload))
+        except zmq.error.ZMQError as e:
+            logging.error(f"A ZMQ error occurred while sending the request: {e}")
+            return {
+                "status": "error",
+                "message": f"ZMQ communication error: {e}",
+                "error_code": 500,
+            }
+        # asyncio.wait does not cancel the future on timeout, so a late reply cannot hit a cancelled future
+        done, _ = await asyncio.wait({future}, timeout=self._req_timeout_s)
+        if not done:
+            return self._expire_pipelined(python_id, request.get("action"))
+        response = future.result()
+        end_to_end_duration = (time.perf_counter_ns() - start_ns) / 1e6
+        response["end_to_end_duration_ms"] = round(end_to_end_duration, 2)
+        return response
+
     def _connect_sub_socket(self, pub_endpoint):
         """Internal method to connect the SUB socket"""
         self.sub_socket = self.context.socket(zmq.SUB)
         self.sub_socket.linger = 0
+        self.sub_socket.rcvhwm = SUB_RCVHWM
         self.sub_socket.curve_serverkey = self.server_public_key
         self.sub_socket.curve_publickey = self.client_public_key
         self.sub_socket.curve_secretkey = self.client_secret_key
         self.sub_socket.connect(pub_endpoint)
+        # Topic filters belong to the socket, so on a reconnect the new socket gets the filters of the
+        # subscriptions this client still holds; subscribe_symbols only installs them for the first symbol
+        if self._subscribed_symbols:
+            self.sub_socket.setsockopt(zmq.SUBSCRIBE, _TICK_TOPIC_PREFIX_BYTES)
+        if self._heartbeat_subscribed:
+            self.sub_socket.setsockopt(zmq.SUBSCRIBE, _HEARTBEAT_TOPIC_BYTES)
+        # Owned by the listener thread, which adds its wake-up socket on start
+        self._sub_poller = zmq.Poller()
+        self._sub_poller.register(self.sub_socket, zmq.POLLIN)
         logging.info(f"Connected to encrypted publishing port: {pub_endpoint}")
 
+    def _create_wake_pair(self, name: str):
+        """
+        Creates a connected inproc PAIR (rx, tx). A background thread polls rx alongside its data socket,
+        so it can block without a timeout and still be woken up immediately on shutdown.
+        """
+        endpoint = f"inproc://mt5bridge-{name}-wake-{id(self)}-{next(_inproc_ids)}"
+        wake_rx = self.context.socket(zmq.PAIR)
+        wake_rx.linger = 0
+        wake_rx.bind(endpoint)
+        wake_tx = self.context.socket(zmq.PAIR)
+        wake_tx.linger = 0
+        wake_tx.connect(endpoint)
+        return wake_rx, wake_tx
+
+    def _stop_listener(self):
+        """Wakes and joins the listener thread, then closes its wake pair and SUB socket."""
+        if self._listener_wake_tx:
+            self._listener_wake_tx.send(b"")
+        if self.listener_thread and self.listener_thread.is_alive():
+            self.listener_thread.join(timeout=1)
+        for sock in (self._listener_wake_tx, self._listener_wake_rx, self.sub_socket):
+            if sock:
+                sock.close()
+        self.listener_thread = None
+        self._listener_wake_rx = self._listener_wake_tx = None
+        self.sub_socket = None
+
     def _listen_for_updates(self):
-        poller = zmq.Poller()
-        poller.register(self.sub_socket, zmq.POLLIN)
+        poller = self._sub_poller
+        poller.register(self._listener_wake_rx, zmq.POLLIN)
         logging.info("Listener thread starting its loop...")
         while not self.stop_event.is_set():
             try:
-                if poller.poll(200):
-                    topic, data_str = self.sub_socket.recv_multipart()
-                    data = json.loads(data_str.decode("utf-8"))
-                    logging.info(
-                        f"[Subscribed Data] Topic: {topic.decode('utf-8')}, Content: {data}"
-                    )
+                # Block until data arrives or close() sends the wake-up signal; no periodic wakeups
+                events = dict(poller.poll())
+                if self._listener_wake_rx in events:
+                    break
+                # Drain the whole burst queued since the last wakeup before polling again
+                while not self.stop_event.is_set():
+                    try:
+                        # Zero-copy receive: only the short topic frame is copied
+                        topic_frame, data_frame = self.sub_socket.recv_multipart(
+                            zmq.NOBLOCK, copy=False
+                        )
+                    except zmq.Again:
+                        break
+                    self._handle_update(topic_frame.bytes, data_frame)
             except zmq.error.ContextTerminated:
                 break
         logging.info("Listener thread has stopped.")
 
+    def _handle_update(self, topic: bytes, data_frame):
+        """Processes one subscription message; ticks of unsubscribed symbols are dropped before decoding."""
+        if (
+            topic.startswith(_TICK_TOPIC_PREFIX_BYTES)
+            and topic[len(_TICK_TOPIC_PREFIX_BYTES) :] not in self._tick_filter
+        ):
+            return
+        # Nothing consumes the payload except the log, so skip decoding entirely when it is disabled
+        if not _tick_logger.isEnabledFor(logging.INFO):
+            return
+        data = _json_loads(data_frame.buffer)
+        _tick_logger.info(
+            "[Subscribed Data] Topic: %s, Content: %s", topic.decode("utf-8"), data
+        )
+
     def close(self):
         logging.info("Closing the client...")
         self.stop_event.set()
-        if self.listener_thread and self.listener_thread.is_alive():
-            self.listener_thread.join(timeout=1)
+        self._stop_listener()
+        self._stop_dealer()
+        self._reset_handshake_socket()
+        # Pending cache writes finish in the background; the cache is only an optimization
+        self._cache_executor.shutdown(wait=False)
+        self._request_executor.shutdown(wait=False)
         if self.req_socket:
             self.req_socket.close()
-        if self.sub_socket:
-            self.sub_socket.close()
-        self.context.term()
+        # The shared context outlives this client; it is destroyed at interpreter exit
         logging.info("Client has been fully closed.")
 
     def _generate_python_id(self) -> str:
-        return f"{int(time.time() * 1000)}-{random.randint(1000, 9999)}"
+        return format(next(self._id_counter), "x")
+
+    def _encode_request(self, request: dict, python_id: str) -> bytes:
+        """
+        Encodes a request together with the auth_key/python_id envelope; the request dict is left untouched.
+        With JSON the envelope is a precomputed byte prefix, so only the request's own fields are encoded,
+        and single-field requests (e.g. {"action": "get_account_info"}) reuse their encoded body.
+        """
+        if self._dumps is not _json_dumps:
+            return self._dumps(
+                {**request, "auth_key": self._auth_key, "python_id": python_id}
+            )
+        if len(request) == 1:
+            body = self._const_request_bodies.get(request.get("action"))
+            if body is None:
+                body = b"," + _json_dumps(request)[1:]
+                if "action" in request:
+                    self._const_request_bodies[request["action"]] = body
+        else:
+            body = _json_dumps(request)
+            # An empty request closes the envelope directly; otherwise its fields follow a comma
+            body = b"}" if body == b"{}" else b"," + body[1:]
+        return self._envelope_prefix + python_id.encode("ascii") + b'"' + body
 
     def _send_request(self, request: dict) -> dict:
+        """Sends a request and waits for its reply; the caller's dict is left untouched."""
         if not self.req_socket:
             return {
                 "status": "error",
                 "message": "Client not connected",
                 "error_code": 503,
             }
-        request["auth_key"] = self.config["auth_key"]
-        request["python_id"] = self._generate_python_id()
+        python_id = self._generate_python_id()
+        payload = self._encode_request(request, python_id)
+        if self.pipelined_requests:
+            return self._send_pipelined_request(request, python_id, payload)
+        clock = time.perf_counter_ns
         with self.req_lock:
+            # Bound under the lock: a timeout replaces the socket and its poller registration
+            sock = self.req_socket
             try:
-                start_time = time.time()
-                self.req_socket.send_json(request)
-                poller = zmq.Poller()
-                poller.register(self.req_socket, zmq.POLLIN)
-                if poller.poll(self.config["request_timeout"]):
-                    response = self.req_socket.recv_json()
-                    end_to_end_duration = (time.time() - start_time) * 1000
-                    response["end_to_end_duration_ms"] = f"{end_to_end_duration:.2f}"
+                start_ns = clock()
+                sock.send(payload, copy=False)
+                if self._req_poller.poll(self._req_timeout_ms):
+                    response = self._loads(sock.recv(copy=False).buffer)
+                    end_to_end_duration = (clock() - start_ns) / 1e6
+                    response["end_to_end_duration_ms"] = round(end_to_end_duration, 2)
                     return response
                 else:
                     # [Robustness] Timeout self-healing logic
@@ -303,12 +988,64 @@ class APIClient:
                     }
             except zmq.error.ZMQError as e:
                 logging.error(f"A ZMQ error occurred while sending the request: {e}")
+                # A failed send/recv leaves the REQ socket in the wrong state for the next request
+                if not self.stop_event.is_set():
+                    try:
+                        self._connect_req_socket()
+                    except zmq.error.ZMQError as reconnect_error:
+                        logging.error(
+                            f"Failed to reconnect the REQ socket: {reconnect_error}"
+                        )
                 return {
                     "status": "error",
                     "message": f"ZMQ communication error: {e}",
                     "error_code": 500,
                 }
 
+    def batch(self, requests: list) -> list:
+        """
+        Sends several independent requests and returns their responses in the same order.
+        In pipelined mode all requests are in flight at once, so the batch costs about one round-trip;
+        otherwise they are sent back to back over the REQ socket.
+        """
+        if not (self.pipelined_requests and self._dealer_outbox):
+            return [self._send_request(request) for request in requests]
+        start_ns = time.perf_counter_ns()
+        deadline = time.monotonic() + self._req_timeout_s
+        submitted = []
+        for request in requests:
+            python_id = self._generate_python_id()
+            try:
+                future = self._submit_pipelined(
+                    python_id, self._encode_request(request, python_id)
+                )
+            except zmq.error.ZMQError as e:
+                logging.error(f"A ZMQ error occurred while sending the request: {e}")
+                future = {
+                    "status": "error",
+                    "message": f"ZMQ communication error: {e}",
+                    "error_code": 500,
+                }
+            submitted.append((request, python_id, future))
+
+        responses = []
+        for request, python_id, future in submitted:
+            if isinstance(future, dict):
+                responses.append(future)
+                continue
+            try:
+                response = future.result(max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                responses.append(
+                    self._expire_pipelined(python_id, request.get("action"))
+                )
+                continue
+            # Measured from the start of the batch up to the moment this reply was collected
+            end_to_end_duration = (time.perf_counter_ns() - start_ns) / 1e6
+            response["end_to_end_duration_ms"] = round(end_to_end_duration, 2)
+            responses.append(response)
+        return responses
+
     # --- Query APIs ---
     def get_account_info(self):
         return self._send_request({"action": "get_account_info"})
@@ -323,7 +1060,96 @@ class APIClient:
         return self._send_request({"action": "get_pending_orders", "symbol": symbol})
 
     def get_price(self, symbol: str):
-        return self._send_request({"action": "get_price", "symbol": symbol})
+        cached = self._cached_price(symbol)
+        if cached is not None:
+            return cached
+        return self._remember_price(
+            symbol,
+            self._with_retry({"action": "get_price", "symbol": symbol}),
+        )
+
+    def _cached_price(self, symbol: str):
+        if not self.price_cache:
+            return None
+        entry = self._price_cache.get(symbol)
+        if entry is not None and time.monotonic() - entry[0] < PRICE_CACHE_TTL_S:
+            # No round-trip was made for a cached reply
+            return dict(entry[1], end_to_end_duration_ms=0.0, cached=True)
+        return None
+
+    def _remember_price(self, symbol: str, response: dict) -> dict:
+        if self.price_cache and response.get("status") == "success":
+            self._price_cache[symbol] = (time.monotonic(), response)
+        return response
+
+    # --- Async Query APIs (see async_send) ---
+    async def async_get_account_info(self):
+        return await self.async_send({"action": "get_account_info"})
+
+    async def async_get_server_info(self):
+        return await self.async_send({"action": "get_server_info"})
+
+    async def async_get_positions(self, symbol: str = ""):
+        return await self.async_send({"action": "get_positions", "symbol": symbol})
+
+    async def async_get_price(self, symbol: str):
+        cached = self._cached_price(symbol)
+        if cached is not None:
+            return cached
+        return self._remember_price(
+            symbol,
+            await self._async_with_retry({"action": "get_price", "symbol": symbol}),
+        )
+
+    # --- Wait Helpers (poll the account state instead of sleeping a fixed time) ---
+    def wait_for_positions(
+        self,
+        expected_count: int,
+        symbol: str = None,
+        timeout: float = 3.0,
+        poll: float = 0.05,
+    ) -> bool:
+        """Polls get_positions until at least expected_count positions (of symbol, if given) are open."""
+        deadline = time.monotonic() + timeout
+        while True:
+            response = self.get_positions(symbol or "")
+            if (
+                response.get("status") == "success"
+                and len(response.get("data") or []) >= expected_count
+            ):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll)
+
+    def wait_for_position_exists(
+        self, ticket: int, timeout: float = 2.0, poll: float = 0.05
+    ) -> bool:
+        """Polls get_positions until the position with the given ticket is listed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._lists_ticket(self.get_positions(), ticket):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll)
+
+    async def async_wait_for_position_exists(
+        self, ticket: int, timeout: float = 2.0, poll: float = 0.05
+    ) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._lists_ticket(await self.async_get_positions(), ticket):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(poll)
+
+    @staticmethod
+    def _lists_ticket(response: dict, ticket: int) -> bool:
+        return response.get("status") == "success" and any(
+            p.get("ticket") == ticket for p in response.get("data") or []
+        )
 
     # --- Historical Data API (with caching) ---
     def get_historical_data(
@@ -333,59 +1159,89 @@ class APIClient:
         start_time=None,
         end_time=None,
         count: int = 0,
+        assume_sorted: bool = False,
     ):
-        # 1. Generate cache filename
-        start_ts = (
-            int(start_time.timestamp()) if isinstance(start_time, datetime) else 0
-        )
-        end_ts = int(end_time.timestamp()) if isinstance(end_time, datetime) else 0
-        cache_filename = f"{symbol}_{timeframe}_{start_ts}_{end_ts}_{count}.parquet"
-        cache_path = os.path.join(self.history_cache_dir, cache_filename)
+        """
+        Fetches historical bars, using the on-disk cache when possible.
 
-        # 2. Check cache
-        if os.path.exists(cache_path):
-            try:
-                logging.info(f"Loading historical data from cache: {cache_path}")
-                df = pd.read_parquet(cache_path)
+        :param assume_sorted: Skip sorting by time when the server is known to return bars in ascending order.
+        """
+        # 1. Normalize the requested time range into the cache key
+        start_ts = self._to_timestamp(start_time)
+        end_ts = self._to_timestamp(end_time)
+        cache_key = (symbol, timeframe, start_ts, end_ts, count)
+
+        # 2. Check the in-memory cache
+        with self._history_lock:
+            df = self._cache_hits.get(cache_key)
+            if df is not None:
+                self._cache_hits.move_to_end(cache_key)
+        if df is not None:
+            return df.copy(deep=False)
+
+        # 3. Time-range queries are served from the partitioned dataset, fetching only uncovered ranges
+        if start_ts and ds is not None:
+            df = self._get_history_range(
+                symbol, timeframe, start_ts, end_ts or int(time.time())
+            )
+            if df.empty or not end_ts:
+                # Open-ended ranges grow over time, so they are not kept in memory
                 return df
+            self._remember_history(cache_key, df)
+            return df.copy(deep=False)
+
+        # 4. Position-based queries use one cache file per request
+        cache_filename = (
+            f"{symbol}_{timeframe}_{start_ts}_{end_ts}_{count}{HISTORY_CACHE_SUFFIX}"
+        )
+        cache_path = f"{self._cache_dir}/{cache_filename}"
+        with self._history_lock:
+            known_missing = cache_filename in self._cache_missing
+        cache_exists = not known_missing and os.path.exists(cache_path)
+        if not cache_exists and not known_missing:
+            with self._history_lock:
+                if len(self._cache_missing) >= HISTORY_MISSING_CACHE_MAX_ENTRIES:
+                    self._cache_missing.clear()
+                self._cache_missing.add(cache_filename)
+        if cache_exists:
+            try:
+                logging.info("Loading historical data from cache: %s", cache_path)
+                if feather is not None:
+                    df = feather.read_table(cache_path, memory_map=True).to_pandas(
+                        split_blocks=True, self_destruct=True
+                    )
+                else:
+                    df = pd.read_parquet(cache_path)
+                self._remember_history(cache_key, df)
+                return df.copy(deep=False)
             except Exception as e:
                 logging.warning(
                     f"Failed to read cache file {cache_path}: {e}. Will refetch from server."
                 )
 
-        # 3. Cache miss, fetch from server
+        # 5. Cache miss, fetch from server
         request = {"action": "get_bars", "symbol": symbol, "timeframe": timeframe}
-        if start_time:
-            st = start_time
-            if isinstance(st, str):
-                st = datetime.strptime(st, "%Y-%m-%d %H:%M:%S")
-            request["start_time"] = int(st.timestamp())
-
-            if end_time:
-                et = end_time
-                if isinstance(et, str):
-                    et = datetime.strptime(et, "%Y-%m-%d %H:%M:%S")
-                request["end_time"] = int(et.timestamp())
-            else:
-                request["end_time"] = 0
+        if start_ts:
+            request["start_time"] = start_ts
+            request["end_time"] = end_ts
         else:
             request["start_pos"] = 0
             request["count"] = count if count > 0 else 100
 
         response = self._send_request(request)
 
-        # 4. Process response and save to cache
+        # 6. Process response and save to cache
         if response.get("status") == "success" and response.get("data"):
-            df = pd.DataFrame.from_records(response["data"])
+            df = self._bars_to_dataframe(response["data"], assume_sorted)
             if not df.empty:
-                df["time"] = pd.to_datetime(df["time"], unit="s")
-                df.set_index("time", inplace=True)
-                df.sort_index(inplace=True)  # Ensure time in ascending order
-                try:
-                    df.to_parquet(cache_path)
-                    logging.info(f"Historical data cached to: {cache_path}")
-                except Exception as e:
-                    logging.warning(f"Failed to cache historical data: {e}")
+                future = self._cache_executor.submit(
+                    self._write_history_cache_file, df, cache_path
+                )
+                future.add_done_callback(
+                    lambda f: self._on_history_cache_written(f, cache_filename)
+                )
+                self._remember_history(cache_key, df)
+                return df.copy(deep=False)
             return df
         else:
             logging.error(
@@ -393,42 +1249,462 @@ class APIClient:
             )
             return pd.DataFrame()
 
+    @staticmethod
+    def _write_history_cache_file(df: pd.DataFrame, cache_path: str):
+        if feather is not None:
+            feather.write_feather(df, cache_path, compression=FEATHER_COMPRESSION)
+        else:
+            df.to_parquet(cache_path)
+
+    def _on_history_cache_written(self, future, cache_filename: str):
+        """Completion callback of a background cache write (runs on the writer thread)."""
+        e = future.exception()
+        if e is not None:
+            logging.warning(f"Failed to cache historical data: {e}")
+            return
+        with self._history_lock:
+            self._cache_missing.discard(cache_filename)
+        logging.info(
+            "Historical data cached to: %s", f"{self._cache_dir}/{cache_filename}"
+        )
+
+    @staticmethod
+    def _to_timestamp(value) -> int:
+        """Converts a datetime or 'YYYY-MM-DD HH:MM:SS' string to a Unix timestamp; empty values map to 0."""
+        if isinstance(value, datetime):
+            return int(value.timestamp())
+        if not value:
+            return 0
+        return _parse_time_string(value)
+
+    def _get_history_range(
+        self, symbol: str, timeframe: str, start_ts: int, end_ts: int
+    ) -> pd.DataFrame:
+        """
+        Returns bars in [start_ts, end_ts] from the partitioned dataset, fetching only the sub-ranges
+        that were never downloaded. Bars that may still be forming are returned but not persisted.
+        """
+        coverage = self._load_history_coverage()
+        covered = coverage.setdefault(f"{symbol}/{timeframe}", [])
+        # Only bars that are certainly closed are written and marked as covered
+        settled_ts = int(time.time()) - _timeframe_seconds(timeframe)
+        fresh_records = []
+        for gap_start, gap_end in _missing_ranges(covered, start_ts, end_ts):
+            response = self._send_request(
+                {
+                    "action": "get_bars",
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "start_time": gap_start,
+                    "end_time": gap_end,
+                }
+            )
+            if response.get("status") != "success":
+                logging.error(
+                    f"Failed to get historical data: {response.get('message', 'Unknown error')}"
+                )
+                return pd.DataFrame()
+            records = response.get("data") or []
+            settled_end = min(gap_end, settled_ts)
+            settled = [r for r in records if gap_start <= r["time"] <= settled_end]
+            fresh_records.extend(r for r in records if r["time"] > settled_end)
+            try:
+                if settled:
+                    self._append_to_history_dataset(symbol, timeframe, settled)
+                if settled_end >= gap_start:
+                    _add_range(covered, gap_start, settled_end)
+                    self._save_history_coverage()
+            except Exception as e:
+                logging.warning(f"Failed to cache historical data: {e}")
+
+        df = self._read_history_dataset(symbol, timeframe, start_ts, end_ts)
+        if fresh_records:
+            fresh_df = self._bars_to_dataframe(fresh_records)
+            df = fresh_df if df.empty else pd.concat([df, fresh_df])
+            df = df[~df.index.duplicated(keep="last")]
+        if not df.empty:
+            df.sort_index(inplace=True)
+        return df
+
+    def _load_history_coverage(self) -> dict:
+        """Loads the covered time ranges of the history dataset once per client."""
+        if self._history_coverage is None:
+            coverage_path = f"{self._history_dataset_dir}/{HISTORY_COVERAGE_FILENAME}"
+            try:
+                with open(coverage_path, "rb") as f:
+                    self._history_coverage = _json_loads(f.read())
+            except FileNotFoundError:
+                self._history_coverage = {}
+            except (OSError, ValueError) as e:
+                logging.warning(
+                    f"Failed to read history coverage file '{coverage_path}': {e}. Cached ranges will be refetched."
+                )
+                self._history_coverage = {}
+        return self._history_coverage
+
+    def _save_history_coverage(self):
+        os.makedirs(self._history_dataset_dir, exist_ok=True)
+        coverage_path = f"{self._history_dataset_dir}/{HISTORY_COVERAGE_FILENAME}"
+        with open(coverage_path, "wb") as f:
+            f.write(_json_dumps(self._history_coverage))
+
+    def _append_to_history_dataset(self, symbol: str, timeframe: str, records: list):
+        """Appends bar dicts to the hive-partitioned dataset (symbol=/timeframe=/year=)."""
+        columns = {key: [r[key] for r in records] for key in records[0]}
+        columns["symbol"] = [symbol] * len(records)
+        columns["timeframe"] = [timeframe] * len(records)
+        columns["year"] = [
+            datetime.fromtimestamp(t, timezone.utc).year for t in columns["time"]
+        ]
+        table = pa.table(columns)
+        # Fixed bar column types, so every parquet file in the dataset has the same schema
+        table = table.cast(_with_bar_types(table.schema))
+        pq.write_to_dataset(
+            table,
+            self._history_dataset_dir,
+            partition_cols=HISTORY_PARTITION_COLUMNS,
+            max_rows_per_group=PARQUET_ROW_GROUP_SIZE,
+            **PARQUET_COMPRESSION_OPTIONS,
+        )
+        logging.info(
+            "Cached %d %s %s bars to: %s",
+            len(records),
+            symbol,
+            timeframe,
+            self._history_dataset_dir,
+        )
+
+    def _read_history_dataset(
+        self, symbol: str, timeframe: str, start_ts: int, end_ts: int
+    ) -> pd.DataFrame:
+        """Reads the bars of one symbol/timeframe in [start_ts, end_ts], pruning partitions by year."""
+        if not os.path.isdir(self._history_dataset_dir):
+            return pd.DataFrame()
+        dataset = ds.dataset(
+            self._history_dataset_dir, format="parquet", partitioning="hive"
+        )
+        if "time" not in dataset.schema.names:
+            return pd.DataFrame()
+        bar_columns = [
+            name
+            for name in dataset.schema.names
+            if name not in HISTORY_PARTITION_COLUMNS
+        ]
+        table = dataset.to_table(
+            columns=bar_columns,
+            filter=(ds.field("symbol") == symbol)
+            & (ds.field("timeframe") == timeframe)
+            & (ds.field("year") >= datetime.fromtimestamp(start_ts, timezone.utc).year)
+            & (ds.field("year") <= datetime.fromtimestamp(end_ts, timezone.utc).year)
+            & (ds.field("time") >= start_ts)
+            & (ds.field("time") <= end_ts),
+        )
+        if table.num_rows == 0:
+            return pd.DataFrame()
+        df = table.to_pandas()
+        df.index = pd.to_datetime(df.pop("time"), unit="s").rename("time")
+        return df
+
+    def _remember_history(self, cache_key: tuple, df: pd.DataFrame):
+        """Stores a DataFrame in the in-memory history cache, evicting least recently used entries beyond the row budget."""
+        if len(df) > HISTORY_MEMORY_CACHE_MAX_ROWS:
+            return
+        with self._history_lock:
+            previous = self._cache_hits.pop(cache_key, None)
+            if previous is not None:
+                self._cache_rows -= len(previous)
+            self._cache_hits[cache_key] = df
+            self._cache_rows += len(df)
+            while self._cache_rows > HISTORY_MEMORY_CACHE_MAX_ROWS:
+                _, evicted = self._cache_hits.popitem(last=False)
+                self._cache_rows -= len(evicted)
+
+    @staticmethod
+    def _bars_to_dataframe(records, assume_sorted: bool = False) -> pd.DataFrame:
+        """
+        Builds a time-indexed DataFrame from the server's bars in a single columnar pass.
+        Accepts either a list of bar dicts or an already columnar dict of lists (msgpack responses).
+        """
+        if isinstance(records, dict):
+            columns = {
+                key: np.asarray(values, dtype=_BAR_DTYPES.get(key))
+                for key, values in records.items()
+            }
+        elif pa is not None:
+            # Arrow converts the list of dicts into columns in one C-level pass; the known bar
+            # columns are then cast to their fixed types and any other field is kept as inferred
+            table = pa.Table.from_pylist(records)
+            table = table.cast(_with_bar_types(table.schema))
+            times = table.column("time").to_numpy()
+            if not assume_sorted and len(times) > 1 and (times[1:] < times[:-1]).any():
+                order = np.argsort(times, kind="stable")
+                table = table.take(order)
+                times = times[order]
+            df = table.remove_column(table.schema.get_field_index("time")).to_pandas(
+                split_blocks=True, self_destruct=True
+            )
+            df.index = pd.DatetimeIndex(
+                times.astype("datetime64[s]").astype("datetime64[ns]"), name="time"
+            )
+            return df
+        else:
+            n = len(records)
+            columns = {}
+            for key in records[0]:
+                dtype = _BAR_DTYPES.get(key)
+                if dtype is None:
+                    columns[key] = np.array([r[key] for r in records])
+                else:
+                    columns[key] = np.fromiter(
+                        (r[key] for r in records), dtype=dtype, count=n
+                    )
+        times = columns.pop("time")
+        # Bars normally arrive in order; the O(n) check avoids an argsort and a reindex in that case
+        if not assume_sorted and len(times) > 1 and (times[1:] < times[:-1]).any():
+            order = np.argsort(times, kind="stable")
+            times = times[order]
+            columns = {key: values[order] for key, values in columns.items()}
+        index = pd.DatetimeIndex(
+            times.astype("datetime64[s]").astype("datetime64[ns]"), name="time"
+        )
+        return pd.DataFrame(columns, index=index, copy=False)
+
     # --- Subscription APIs ---
     def subscribe_symbols(self, symbols: list):
-        for symbol in symbols:
-            self.sub_socket.setsockopt_string(zmq.SUBSCRIBE, f"TICK.{symbol}")
-        self.sub_socket.setsockopt_string(zmq.SUBSCRIBE, "HEARTBEAT")
-        return self._send_request({"action": "subscribe_symbols", "symbols": symbols})
+        """Subscribes to the tick feed of all given symbols.
+
+        Pass the whole symbol list in one call rather than one symbol at a time:
+        the SUB socket keeps a single topic prefix filter and the symbols are sent
+        to the server in chunks of SUBSCRIPTION_CHUNK_SIZE, one request per chunk.
+        """
+        symbols = list(symbols)
+        if not self._subscribed_symbols:
+            self.sub_socket.setsockopt(zmq.SUBSCRIBE, _TICK_TOPIC_PREFIX_BYTES)
+        if not self._heartbeat_subscribed:
+            self.sub_socket.setsockopt(zmq.SUBSCRIBE, _HEARTBEAT_TOPIC_BYTES)
+            self._heartbeat_subscribed = True
+        self._subscribed_symbols.update(symbols)
+        self._update_tick_filter()
+        return self._send_symbol_chunks("subscribe_symbols", symbols)
 
     def unsubscribe_symbols(self, symbols: list):
-        for symbol in symbols:
-            self.sub_socket.setsockopt_string(zmq.UNSUBSCRIBE, f"TICK.{symbol}")
-        return self._send_request({"action": "unsubscribe_symbols", "symbols": symbols})
+        """Unsubscribes the given symbols; the topic filter is dropped once none remain."""
+        symbols = list(symbols)
+        had_subscriptions = bool(self._subscribed_symbols)
+        self._subscribed_symbols.difference_update(symbols)
+        self._update_tick_filter()
+        if had_subscriptions and not self._subscribed_symbols:
+            self.sub_socket.setsockopt(zmq.UNSUBSCRIBE, _TICK_TOPIC_PREFIX_BYTES)
+        return self._send_symbol_chunks("unsubscribe_symbols", symbols)
+
+    def unsubscribe_all(self):
+        """Drops every tick subscription and the heartbeat filter."""
+        symbols = list(self._subscribed_symbols)
+        if symbols:
+            self.sub_socket.setsockopt(zmq.UNSUBSCRIBE, _TICK_TOPIC_PREFIX_BYTES)
+        if self._heartbeat_subscribed:
+            self.sub_socket.setsockopt(zmq.UNSUBSCRIBE, _HEARTBEAT_TOPIC_BYTES)
+            self._heartbeat_subscribed = False
+        self._subscribed_symbols.clear()
+        self._update_tick_filter()
+        return self._send_symbol_chunks("unsubscribe_symbols", symbols)
+
+    def _send_symbol_chunks(self, action, symbols):
+        """Sends a symbol list action in chunks and merges the replies into one response."""
+        chunks = [
+            symbols[i : i + SUBSCRIPTION_CHUNK_SIZE]
+            for i in range(0, len(symbols), SUBSCRIPTION_CHUNK_SIZE)
+        ] or [symbols]
+        responses = []
+        for chunk in chunks:
+            response = self._send_request({"action": action, "symbols": chunk})
+            if response.get("status") != "success":
+                return response
+            responses.append(response)
+        if len(responses) == 1:
+            return responses[0]
+        # [Merge] Counters are summed and lists concatenated across the chunk replies
+        data = {}
+        for response in responses:
+            for key, value in (response.get("data") or {}).items():
+                if key not in data:
+                    data[key] = value
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    data[key] += value
+                elif isinstance(value, list):
+                    data[key] = data[key] + value
+        merged = dict(responses[-1])
+        merged["data"] = data
+        merged["end_to_end_duration_ms"] = round(
+            sum(r.get("end_to_end_duration_ms", 0) for r in responses), 2
+        )
+        return merged
+
+    def _update_tick_filter(self):
+        """Publishes an immutable snapshot of the subscribed symbols for the listener thread."""
+        self._tick_filter = frozenset(
+            symbol.encode("utf-8") for symbol in self._subscribed_symbols
+        )
 
     # --- Trading APIs ---
-    def buy(self, **kwargs):
-        kwargs["action"] = "buy"
-        return self._send_request(kwargs)
+    @staticmethod
+    def _complete_order(
+        request: dict, price=None, sl=None, tp=None, extra: dict = None
+    ) -> dict:
+        """Completes a trading request in place; optional fields are only sent when given."""
+        if price is not None:
+            request["price"] = price
+        if sl is not None:
+            request["sl"] = sl
+        if tp is not None:
+            request["tp"] = tp
+        if extra:
+            request.update(extra)
+        return request
+
+    def _with_retry(self, request: dict) -> dict:
+        """Sends a read-only request, re-sending it with exponential backoff while it fails with one of RETRY_ERROR_CODES."""
+        delay = RETRY_BASE_DELAY_S
+        for _ in range(RETRY_MAX_ATTEMPTS - 1):
+            response = self._send_request(request)
+            if response.get("error_code") not in RETRY_ERROR_CODES:
+                return response
+            logging.warning(
+                "Request '%s' failed (%s), retrying in %.0f ms",
+                request.get("action"),
+                response.get("error_code"),
+                delay * 1000,
+            )
+            time.sleep(delay)
+            delay *= 2
+        return self._send_request(request)
+
+    async def _async_with_retry(self, request: dict) -> dict:
+        delay = RETRY_BASE_DELAY_S
+        for _ in range(RETRY_MAX_ATTEMPTS - 1):
+            response = await self.async_send(request)
+            if response.get("error_code") not in RETRY_ERROR_CODES:
+                return response
+            logging.warning(
+                "Request '%s' failed (%s), retrying in %.0f ms",
+                request.get("action"),
+                response.get("error_code"),
+                delay * 1000,
+            )
+            await asyncio.sleep(delay)
+            delay *= 2
+        return await self.async_send(request)
+
+    def _send_order(
+        self, request: dict, price=None, sl=None, tp=None, extra: dict = None
+    ) -> dict:
+        return self._send_request(self._complete_order(request, price, sl, tp, extra))
+
+    def buy(self, symbol: str, volume: float, price=None, sl=None, tp=None, **extra):
+        return self._send_order(
+            {"action": "buy", "symbol": symbol, "volume": volume}, price, sl, tp, extra
+        )
+
+    def sell(self, symbol: str, volume: float, price=None, sl=None, tp=None, **extra):
+        return self._send_order(
+            {"action": "sell", "symbol": symbol, "volume": volume}, price, sl, tp, extra
+        )
+
+    def buy_limit(
+        self, symbol: str, volume: float, price: float, sl=None, tp=None, **extra
+    ):
+        return self._send_order(
+            {"action": "buy_limit", "symbol": symbol, "volume": volume},
+            price,
+            sl,
+            tp,
+            extra,
+        )
+
+    def sell_limit(
+        self, symbol: str, volume: float, price: float, sl=None, tp=None, **extra
+    ):
+        return self._send_order(
+            {"action": "sell_limit", "symbol": symbol, "volume": volume},
+            price,
+            sl,
+            tp,
+            extra,
+        )
+
+    def modify_position(self, ticket: int, sl=None, tp=None, **extra):
+        return self._send_order(
+            {"action": "modify_position", "ticket": ticket}, None, sl, tp, extra
+        )
 
-    def sell(self, **kwargs):
-        kwargs["action"] = "sell"
-        return self._send_request(kwargs)
+    def close_position_by_ticket(self, ticket: int, **extra):
+        return self._send_order(
+            {"action": "close_position_by_ticket", "ticket": ticket}, extra=extra
+        )
 
-    def buy_limit(self, **kwargs):
-        kwargs["action"] = "buy_limit"
-        return self._send_request(kwargs)
+    def open_then_close(self, symbol: str, volume: float) -> dict:
+        """Opens a market buy and closes it as soon as the fill is confirmed."""
+        opened = self.buy(symbol=symbol, volume=volume)
+        ticket = self._filled_ticket(opened)
+        closed = self.close_position_by_ticket(ticket=ticket) if ticket else None
+        return self._open_close_result(opened, closed, ticket)
 
-    def sell_limit(self, **kwargs):
-        kwargs["action"] = "sell_limit"
-        return self._send_request(kwargs)
+    @staticmethod
+    def _filled_ticket(response: dict):
+        # A successful buy reply is only sent once the deal is filled, so its ticket is the barrier
+        if response.get("status") == "success":
+            return (response.get("data") or {}).get("ticket")
+        return None
 
-    def modify_position(self, **kwargs):
-        kwargs["action"] = "modify_position"
-        return self._send_request(kwargs)
+    @staticmethod
+    def _open_close_result(opened: dict, closed, ticket) -> dict:
+        return {
+            "open": opened,
+            "close": closed,
+            "ticket": ticket,
+            "durations": {
+                "open": opened.get("end_to_end_duration_ms", "N/A"),
+                "close": (
+                    closed.get("end_to_end_duration_ms", "N/A") if closed else "N/A"
+                ),
+            },
+        }
 
-    def close_position_by_ticket(self, **kwargs):
-        kwargs["action"] = "close_position_by_ticket"
-        return self._send_request(kwargs)
+    # --- Async Trading APIs (see async_send) ---
+    async def async_buy(
+        self, symbol: str, volume: float, price=None, sl=None, tp=None, **extra
+    ):
+        return await self.async_send(
+            self._complete_order(
+                {"action": "buy", "symbol": symbol, "volume": volume},
+                price,
+                sl,
+                tp,
+                extra,
+            )
+        )
+
+    async def async_modify_position(self, ticket: int, sl=None, tp=None, **extra):
+        return await self.async_send(
+            self._complete_order(
+                {"action": "modify_position", "ticket": ticket}, None, sl, tp, extra
+            )
+        )
+
+    async def async_close_position_by_ticket(self, ticket: int, **extra):
+        return await self.async_send(
+            self._complete_order(
+                {"action": "close_position_by_ticket", "ticket": ticket}, extra=extra
+            )
+        )
+
+    async def async_open_then_close(self, symbol: str, volume: float) -> dict:
+        opened = await self.async_buy(symbol=symbol, volume=volume)
+        ticket = self._filled_ticket(opened)
+        closed = (
+            await self.async_close_position_by_ticket(ticket=ticket) if ticket else None
+        )
+        return self._open_close_result(opened, closed, ticket)
 
     # --- Bulk Management APIs ---
     def close_all_positions(self):
@@ -1,12 +1,22 @@
 # run_all_tests.py
+import argparse
 import json
 import logging
+import logging.handlers
+import math
+import queue
 import time
 import os
-import pandas as pd
 from rich.console import Console
 from rich.table import Table
-from mt5_bridge_client import APIClient
+from mt5_bridge_client import APIClient, load_json_config
+from test_utils import (
+    REPORT_COLUMNS,
+    StreamingRecorder,
+    results_to_df,
+    status_labels,
+    summarize,
+)
 import test_suite_1_basic_ops
 import test_suite_2_trading_logic
 import test_suite_3_stress_concurrency
@@ -18,43 +28,69 @@ CONFIG_FILE = os.path.join("config", "test_config.json")
 
 
 def load_config():
-    """Load test configuration from a JSON file"""
+    """Load test configuration from a JSON file (parsed once per file modification)"""
     try:
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
+        return load_json_config(CONFIG_FILE)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         logging.error(f"Could not load or parse config file '{CONFIG_FILE}': {e}")
         return None
 
 
+def setup_logging(level=logging.INFO):
+    """
+    Route all logging through a QueueHandler, so the suites' hot paths only enqueue records
+    and a background QueueListener thread does the formatting and stream writes.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    )
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    return listener
+
+
 def setup_directories(config):
     """Ensure all directories defined in the configuration exist"""
     for directory in config["core_paths"].values():
-        if not os.path.exists(directory):
-            logging.info(f"Directory '{directory}' does not exist, creating it...")
-            os.makedirs(directory)
+        os.makedirs(directory, exist_ok=True)
+
+
+def report_base_path(config: dict, timestamp: str) -> str:
+    """Path of the report files for one run, without extension"""
+    return os.path.join(
+        config["core_paths"]["reports_dir"],
+        f"{config['report_settings']['report_base_name']}_{timestamp}",
+    )
 
 
-def generate_report(results: list, config: dict):
+def generate_report(results: list, config: dict, timestamp: str = None):
     """Generate and print the test report using pandas and rich"""
     if not results:
         logging.warning("No test results were collected, cannot generate a report.")
         return
 
     console = Console()
-    df = pd.DataFrame(results)
+    df = results_to_df(results)
+    passed_mask = df["Status"].to_numpy()
+    # Results carry a boolean Status; the report shows the PASS/FAIL labels
+    df["Status"] = status_labels(passed_mask)
 
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    report_filename_base = (
-        f"{config['report_settings']['report_base_name']}_{timestamp}"
-    )
+    base_path = report_base_path(config, timestamp or time.strftime("%Y%m%d_%H%M%S"))
     reports_dir = config["core_paths"]["reports_dir"]
 
-    report_path_csv = os.path.join(reports_dir, f"{report_filename_base}.csv")
-    report_path_html = os.path.join(reports_dir, f"{report_filename_base}.html")
+    report_path_csv = f"{base_path}.csv"
+    report_path_html = f"{base_path}.html"
 
-    df.to_csv(report_path_csv, index=False, encoding="utf-8-sig")
-    df.to_html(report_path_html, index=False)
+    # Missing durations are NaN in the float column and shown as "N/A" everywhere in the report
+    df.to_csv(report_path_csv, index=False, encoding="utf-8-sig", na_rep="N/A")
+    df.to_html(report_path_html, index=False, na_rep="N/A")
     logging.info(f"Test reports have been saved to the '{reports_dir}' folder.")
 
     table = Table(
@@ -68,16 +104,33 @@ def generate_report(results: list, config: dict):
     table.add_column("End-to-End Duration (ms)", style="blue")
     table.add_column("Details", style="white", no_wrap=False)
 
-    display_columns = ["Suite", "Case", "Status", "End-to-End Duration (ms)", "Details"]
-    df_display = df.reindex(columns=display_columns, fill_value="N/A")
+    df_display = df.reindex(columns=REPORT_COLUMNS, fill_value="N/A")
+    df_display = df_display.astype(object).where(df_display.notna(), "N/A")
 
-    for _, row in df_display.iterrows():
-        style = "green" if row["Status"] == "PASS" else "red"
+    for (_, row), passed in zip(df_display.iterrows(), passed_mask):
+        style = "green" if passed else "red"
         table.add_row(*[str(item) for item in row], style=style)
 
     console.print(table)
 
-    total, passed = len(df), len(df[df["Status"] == "PASS"])
+    suite_summary = summarize(results)
+    suite_table = Table(title="Suite Summary", show_header=True)
+    suite_table.add_column("Suite", style="cyan")
+    suite_table.add_column("Cases")
+    suite_table.add_column("[green]Passed[/green]")
+    suite_table.add_column("[red]Failed[/red]")
+    suite_table.add_column("Mean Duration (ms)", style="blue")
+    for suite, cases, passed, failed, mean_ms in suite_summary.itertuples():
+        suite_table.add_row(
+            suite,
+            str(cases),
+            str(passed),
+            str(failed),
+            "N/A" if math.isnan(mean_ms) else f"{mean_ms:.2f}",
+        )
+    console.print(suite_table)
+
+    total, passed = len(df), int(suite_summary["Passed"].sum())
     failed = total - passed
     summary_table = Table(title="Test Summary", show_header=False)
     summary_table.add_column()
@@ -89,12 +142,19 @@ def generate_report(results: list, config: dict):
 
 
 if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    parser = argparse.ArgumentParser(description="Run the MT5 Bridge API test suites")
+    parser.add_argument(
+        "--truly-serial",
+        action="store_true",
+        help="Run the serial benchmark one symbol after another instead of overlapping symbols",
     )
+    cli_args = parser.parse_args()
+
+    log_listener = setup_logging()
 
     config = load_config()
     if not config:
+        log_listener.stop()
         exit(1)
 
     # [Optimization] Extract more parameters from config to drive tests
@@ -105,6 +165,9 @@ if __name__ == "__main__":
     interval_ms = stress_settings.get(
         "request_interval_ms", 100
     )  # [New] Get throttle interval, default 100ms
+    # Optional: poll for each opened position before closing it in the stress test (off by default,
+    # since the polling requests share the command channel with the timed ones)
+    stress_wait_for_listing = stress_settings.get("wait_for_listing", False)
 
     logging.info("=" * 80)
     logging.info(" Initializing test environment...")
@@ -117,6 +180,12 @@ if __name__ == "__main__":
 
     all_results = []
     client = None
+    run_timestamp = time.strftime("%Y%m%d_%H%M%S")
+    # Each suite's results are appended to a JSONL file as soon as the suite finishes,
+    # so they are kept on disk even if a later suite brings the run down before the report
+    results_stream = StreamingRecorder(
+        f"{report_base_path(config, run_timestamp)}_results.jsonl"
+    )
     try:
         client = APIClient(history_cache_dir=config["core_paths"]["history_cache_dir"])
         client.connect()
@@ -134,11 +203,23 @@ if __name__ == "__main__":
             ),
             "Serial Benchmark Test": (  # [New]
                 test_suite_5_serial_benchmark.run,
-                [client, symbols_to_test, iterations, interval_ms],
+                [
+                    client,
+                    symbols_to_test,
+                    iterations,
+                    interval_ms,
+                    cli_args.truly_serial,
+                ],
             ),
             "Concurrent Performance Test (Throttled)": (  # [Optimization]
                 test_suite_3_stress_concurrency.run,
-                [client, symbols_to_test, iterations, interval_ms],
+                [
+                    client,
+                    symbols_to_test,
+                    iterations,
+                    interval_ms,
+                    stress_wait_for_listing,
+                ],
             ),
         }
 
@@ -147,6 +228,8 @@ if __name__ == "__main__":
             results = suite_func(*args)
             if results:
                 all_results.extend(results)
+                results_stream.extend(results)
+                results_stream.flush()
 
     except Exception as e:
         logging.error(
@@ -155,4 +238,7 @@ if __name__ == "__main__":
     finally:
         if client:
             client.close()
-        generate_report(all_results, config)
+        results_stream.close()
+        generate_report(all_results, config, run_timestamp)
+        # Flushes the records still queued before the process exits
+        log_listener.stop()
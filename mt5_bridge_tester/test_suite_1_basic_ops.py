@@ -1,27 +1,52 @@
 # test_suite_1_basic_ops.py
+import asyncio
 import time
 import logging
-from mt5_bridge_client import APIClient
-from test_utils import record_result, record_df_result
+from mt5_bridge_client import (
+    TICK_LOGGER_NAME,
+    TICK_TOPIC_PREFIX,
+    APIClient,
+    enable_tick_logging,
+)
+from test_utils import make_recorder
 from datetime import datetime, timedelta
 
 
+class _TickCounter(logging.Handler):
+    """Counts the tick records of subscribed symbols written to the client's tick logger (heartbeats excluded)."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record):
+        if record.args and str(record.args[0]).startswith(TICK_TOPIC_PREFIX):
+            self.count += 1
+
+
+async def _run_queries(client: APIClient, symbols: list):
+    return await asyncio.gather(
+        client.async_get_account_info(),
+        client.async_get_server_info(),
+        *[client.async_get_price(symbol) for symbol in symbols],
+    )
+
+
 def run(client: APIClient, config: dict):
     suite_name = "Basic Operations"
     results = []
+    record = make_recorder(suite_name)
     symbols_to_test = config["trading_settings"]["symbols_to_test"]
 
-    # Case 1: Get Account Info
-    case_name = "Get Account Info"
-    logging.info(f"--- {suite_name}: {case_name} ---")
-    response = client.get_account_info()
-    results.append(record_result(suite_name, case_name, response))
-
-    # Case 2: Get Server Info
-    case_name = "Get Server Info"
-    logging.info(f"--- {suite_name}: {case_name} ---")
-    response = client.get_server_info()
-    results.append(record_result(suite_name, case_name, response))
+    # Cases 1-2: Get Account Info, Server Info and the current prices. The queries are independent,
+    # so they are issued concurrently and (in pipelined mode) complete in about one round-trip.
+    query_cases = ["Get Account Info", "Get Server Info"] + [
+        f"Get Price ({symbol})" for symbol in symbols_to_test
+    ]
+    logging.info(f"--- {suite_name}: {', '.join(query_cases)} ---")
+    responses = asyncio.run(_run_queries(client, symbols_to_test))
+    for case_name, response in zip(query_cases, responses):
+        results.append(record(case_name, response))
 
     # Case 3: Subscribe to Market Data
     if not symbols_to_test:
@@ -34,8 +59,7 @@ def run(client: APIClient, config: dict):
         response = client.subscribe_symbols(symbols_to_test)
         is_success = response.get("data", {}).get("failed_count", -1) == 0
         results.append(
-            record_result(
-                suite_name,
+            record(
                 case_name,
                 response,
                 success_condition=is_success,
@@ -44,8 +68,50 @@ def run(client: APIClient, config: dict):
         )
 
         if response.get("status") == "success":
-            logging.info("Waiting 5 seconds to receive quote data...")
-            time.sleep(5)
+            # Ticks are counted through the tick logger, which is restored afterwards
+            tick_logger = logging.getLogger(TICK_LOGGER_NAME)
+            previous_level = tick_logger.level
+            counter = enable_tick_logging(_TickCounter())
+            try:
+                logging.info("Waiting 5 seconds to receive quote data...")
+                time.sleep(5)
+                ticks_before = counter.count
+
+                # Case 3b: Reconnect, the subscriptions must keep delivering ticks on the new connection
+                case_name = "Receive Ticks After Reconnect"
+                logging.info(f"--- {suite_name}: {case_name} ---")
+                counter.count = 0
+                try:
+                    client.connect()
+                except ConnectionError as e:
+                    results.append(
+                        record(
+                            case_name,
+                            {},
+                            success_condition=False,
+                            detail_on_fail=f"Reconnect failed: {e}",
+                        )
+                    )
+                else:
+                    time.sleep(2)
+                    ticks_after = counter.count
+                    results.append(
+                        record(
+                            case_name,
+                            {},
+                            # Without ticks before the reconnect (e.g. market closed) there is nothing to compare
+                            success_condition=ticks_after > 0 or ticks_before == 0,
+                            detail_on_pass=(
+                                f"{ticks_after} ticks received after reconnecting"
+                                if ticks_after
+                                else "No ticks before or after reconnecting (market closed?)"
+                            ),
+                            detail_on_fail=f"{ticks_before} ticks before reconnecting, none after",
+                        )
+                    )
+            finally:
+                tick_logger.removeHandler(counter)
+                tick_logger.setLevel(previous_level)
 
     # Case 4: Get Historical Data (by count)
     history_params_count = config["history_test_params"]["by_count"]
@@ -57,18 +123,25 @@ def run(client: APIClient, config: dict):
     case_name = f"Get Historical Candlesticks (by count: {count}, {symbol} {timeframe})"
     logging.info(f"--- {suite_name}: {case_name} ---")
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     df = client.get_historical_data(symbol=symbol, timeframe=timeframe, count=count)
-    duration_ms = f"{(time.time() - start_time) * 1000:.2f}"
+    duration_ms = f"{(time.perf_counter_ns() - start_ns) / 1e6:.2f}"
 
     is_success = df is not None and not df.empty and len(df) == count
-    detail_pass = f"Successfully retrieved {len(df)} candlesticks. Latest close price: {df['close'].iloc[-1]}"
-    detail_fail = f"Failed to retrieve or mismatched count ({len(df) if df is not None else 'None'}/{count})"
     results.append(
-        record_df_result(
-            suite_name, case_name, df, duration_ms, is_success, detail_pass, detail_fail
+        record(
+            case_name,
+            {"end_to_end_duration_ms": duration_ms},
+            success_condition=is_success,
+            detail_on_pass=(
+                f"Successfully retrieved {len(df)} candlesticks. Latest close price: {df['close'].iloc[-1]}"
+                if is_success
+                else ""
+            ),
+            detail_on_fail=f"Failed to retrieve or mismatched count ({len(df) if df is not None else 'None'}/{count})",
         )
     )
+    del df  # Only the formatted details are kept, not the bars
     time.sleep(0.5)
 
     # Case 5: Get Historical Data (by time)
@@ -86,19 +159,25 @@ def run(client: APIClient, config: dict):
     end_dt = datetime.utcnow()
     start_dt = end_dt - timedelta(days=days)
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     df = client.get_historical_data(
         symbol=symbol, timeframe=timeframe, start_time=start_dt, end_time=end_dt
     )
-    duration_ms = f"{(time.time() - start_time) * 1000:.2f}"
+    duration_ms = f"{(time.perf_counter_ns() - start_ns) / 1e6:.2f}"
 
     is_success = df is not None and not df.empty
-    detail_pass = f"Successfully retrieved {len(df)} candlesticks. Time range: {df.index.min()} -> {df.index.max()}"
-    detail_fail = "Failed to retrieve or no data in the specified time range."
     results.append(
-        record_df_result(
-            suite_name, case_name, df, duration_ms, is_success, detail_pass, detail_fail
+        record(
+            case_name,
+            {"end_to_end_duration_ms": duration_ms},
+            success_condition=is_success,
+            detail_on_pass=(
+                f"Successfully retrieved {len(df)} candlesticks. Time range: {df.index.min()} -> {df.index.max()}"
+                if is_success
+                else ""
+            ),
+            detail_on_fail="Failed to retrieve or no data in the specified time range.",
         )
     )
-
+    del df
     return results
@@ -1,122 +1,165 @@
 # test_suite_2_trading_logic.py
-import time
+import asyncio
 import logging
+from collections import deque
 from mt5_bridge_client import APIClient
+from test_utils import ResultsBuffer
 
 
-def get_duration(response: dict) -> str:
-    return response.get("end_to_end_duration_ms", "N/A")
+async def _symbol_rounds(
+    client: APIClient, symbol: str, suite_name: str, results: ResultsBuffer
+) -> deque:
+    """Runs the open -> modify rounds of one symbol in order and returns the tickets it opened."""
+    opened_tickets = deque()
+    for i in range(2):
+        iteration = i + 1
+        logging.info(f"\n--- Symbol {symbol}, Round {iteration}/2 ---")
 
+        # Open Position
+        case_name = f"Open {symbol} Buy Order #{iteration}"
+        logging.info(f"--- {suite_name}: {case_name} ---")
+        response = await client.async_buy(symbol=symbol, volume=0.01)
+        data = response.get("data") if response.get("status") == "success" else None
+        ticket = data.get("ticket") if data else None
+        if ticket:
+            opened_tickets.append(ticket)
+            results.append(
+                suite_name,
+                case_name,
+                True,
+                response.get("end_to_end_duration_ms", "N/A"),
+                f"Order successful, Ticket: {ticket}",
+            )
+        else:
+            results.append(
+                suite_name,
+                case_name,
+                False,
+                response.get("end_to_end_duration_ms", "N/A"),
+                f"Failed to open position: {response.get('message', response)}",
+            )
 
-def run(client: APIClient, symbols_to_test: list):
-    suite_name = "Trading Logic"
-    results = []
-    if not symbols_to_test:
-        logging.warning(
-            "No trading symbols provided in the configuration, skipping trading logic test."
-        )
-        return results
-
-    opened_tickets = {symbol: [] for symbol in symbols_to_test}
-
-    for symbol in symbols_to_test:
-        for i in range(2):
-            iteration = i + 1
-            logging.info(f"\n--- Symbol {symbol}, Round {iteration}/2 ---")
-
-            # Open Position
-            case_name, ticket = f"Open {symbol} Buy Order #{iteration}", None
+        # Modify
+        if ticket:
+            await client.async_wait_for_position_exists(ticket, timeout=2.0)
+            case_name = f"Modify {symbol} Order {ticket} #{iteration}"
             logging.info(f"--- {suite_name}: {case_name} ---")
-            response = client.buy(symbol=symbol, volume=0.01)
-            if response.get("status") == "success" and response.get("data", {}).get(
-                "ticket"
-            ):
-                ticket = response["data"]["ticket"]
-                opened_tickets[symbol].append(ticket)
+            price_info = await client.async_get_price(symbol=symbol)
+            if price_info.get("status") == "success":
+                ask = price_info["data"]["ask"]
+                sl = ask * 0.95
+                tp = ask * 1.05
+                response = await client.async_modify_position(
+                    ticket=ticket, sl=sl, tp=tp
+                )
+                passed = response.get("status") == "success"
+                detail = (
+                    "SL/TP modified successfully"
+                    if passed
+                    else f"Modification failed: {response.get('message')}"
+                )
                 results.append(
-                    {
-                        "Suite": suite_name,
-                        "Case": case_name,
-                        "Status": "PASS",
-                        "End-to-End Duration (ms)": get_duration(response),
-                        "Details": f"Order successful, Ticket: {ticket}",
-                    }
+                    suite_name,
+                    case_name,
+                    passed,
+                    response.get("end_to_end_duration_ms", "N/A"),
+                    detail,
                 )
             else:
                 results.append(
-                    {
-                        "Suite": suite_name,
-                        "Case": case_name,
-                        "Status": "FAIL",
-                        "End-to-End Duration (ms)": get_duration(response),
-                        "Details": f"Failed to open position: {response.get('message', response)}",
-                    }
+                    suite_name,
+                    case_name,
+                    False,
+                    price_info.get("end_to_end_duration_ms", "N/A"),
+                    "Could not get price to set SL/TP",
                 )
-            time.sleep(1)
+            await asyncio.sleep(1)
+    return opened_tickets
+
+
+async def _rejected_order(
+    client: APIClient, symbol: str, suite_name: str, results: ResultsBuffer
+):
+    """A zero-volume order must come back as the server's error reply, not as a client-side timeout."""
+    case_name = f"Reject Invalid {symbol} Order (volume 0)"
+    logging.info(f"--- {suite_name}: {case_name} ---")
+    response = await client.async_buy(symbol=symbol, volume=0)
+    # 408 is the client's own timeout, i.e. the error reply never reached the caller
+    passed = response.get("status") == "error" and response.get("error_code") != 408
+    detail = (
+        f"Rejected by the server: {response.get('message')}"
+        if passed
+        else f"Expected a server error reply, got: {response.get('status')} {response.get('message', '')}"
+    )
+    results.append(
+        suite_name,
+        case_name,
+        passed,
+        response.get("end_to_end_duration_ms", "N/A"),
+        detail,
+    )
 
-            # Modify
-            if ticket:
-                case_name = f"Modify {symbol} Order {ticket} #{iteration}"
-                logging.info(f"--- {suite_name}: {case_name} ---")
-                price_info = client._send_request(
-                    {"action": "get_price", "symbol": symbol}
-                )
-                if price_info.get("status") == "success":
-                    ask = price_info["data"]["ask"]
-                    sl = ask * 0.95
-                    tp = ask * 1.05
-                    response = client.modify_position(ticket=ticket, sl=sl, tp=tp)
-                    status = "PASS" if response.get("status") == "success" else "FAIL"
-                    detail = (
-                        "SL/TP modified successfully"
-                        if status == "PASS"
-                        else f"Modification failed: {response.get('message')}"
-                    )
-                    results.append(
-                        {
-                            "Suite": suite_name,
-                            "Case": case_name,
-                            "Status": status,
-                            "End-to-End Duration (ms)": get_duration(response),
-                            "Details": detail,
-                        }
-                    )
-                else:
-                    results.append(
-                        {
-                            "Suite": suite_name,
-                            "Case": case_name,
-                            "Status": "FAIL",
-                            "End-to-End Duration (ms)": get_duration(price_info),
-                            "Details": "Could not get price to set SL/TP",
-                        }
-                    )
-                time.sleep(1)
+
+async def _close_symbol_positions(
+    client: APIClient,
+    symbol: str,
+    tickets: deque,
+    suite_name: str,
+    results: ResultsBuffer,
+):
+    for ticket in tickets:
+        case_name = f"Close {symbol} Order {ticket}"
+        logging.info(f"--- {suite_name}: {case_name} ---")
+        response = await client.async_close_position_by_ticket(ticket=ticket)
+        passed = response.get("status") == "success"
+        detail = (
+            "Position closed successfully"
+            if passed
+            else f"Failed to close position: {response.get('message')}"
+        )
+        results.append(
+            suite_name,
+            case_name,
+            passed,
+            response.get("end_to_end_duration_ms", "N/A"),
+            detail,
+        )
+        await asyncio.sleep(1)
+
+
+async def _run_symbols(
+    client: APIClient, symbols_to_test: list, suite_name: str, results: ResultsBuffer
+):
+    # Symbols are independent, so they run side by side; each symbol's own steps stay in order
+    opened_tickets = await asyncio.gather(
+        *[
+            _symbol_rounds(client, symbol, suite_name, results)
+            for symbol in symbols_to_test
+        ]
+    )
+
+    await _rejected_order(client, symbols_to_test[0], suite_name, results)
 
     # Close Positions
     logging.info(
         "\n--- Starting unified cleanup of all positions opened during the test ---"
     )
-    for symbol, tickets in opened_tickets.items():
-        for ticket in tickets:
-            case_name = f"Close {symbol} Order {ticket}"
-            logging.info(f"--- {suite_name}: {case_name} ---")
-            response = client.close_position_by_ticket(ticket=ticket)
-            status = "PASS" if response.get("status") == "success" else "FAIL"
-            detail = (
-                "Position closed successfully"
-                if status == "PASS"
-                else f"Failed to close position: {response.get('message')}"
-            )
-            results.append(
-                {
-                    "Suite": suite_name,
-                    "Case": case_name,
-                    "Status": status,
-                    "End-to-End Duration (ms)": get_duration(response),
-                    "Details": detail,
-                }
-            )
-            time.sleep(1)
+    await asyncio.gather(
+        *[
+            _close_symbol_positions(client, symbol, tickets, suite_name, results)
+            for symbol, tickets in zip(symbols_to_test, opened_tickets)
+        ]
+    )
+
+
+def run(client: APIClient, symbols_to_test: list):
+    suite_name = "Trading Logic"
+    results = ResultsBuffer()
+    if not symbols_to_test:
+        logging.warning(
+            "No trading symbols provided in the configuration, skipping trading logic test."
+        )
+        return []
 
-    return results
+    asyncio.run(_run_symbols(client, symbols_to_test, suite_name, results))
+    return results.to_records()
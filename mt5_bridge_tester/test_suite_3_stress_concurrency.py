@@ -1,88 +1,146 @@
 # test_suite_3_stress_concurrency.py
-import time
+import asyncio
 import logging
-import threading
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from mt5_bridge_client import APIClient
+from test_utils import RateLimiter, ResultsBuffer
 
 
-def get_duration(response: dict) -> str:
-    return response.get("end_to_end_duration_ms", "N/A")
+def _gil_disabled() -> bool:
+    """True on a free-threaded (3.13t/3.14t) interpreter running with the GIL off."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
 
 
-def trading_cycle(
+async def trading_cycle(
     client: APIClient,
     symbol: str,
     iterations: int,
-    results_list: list,
+    results_list: ResultsBuffer,
     interval_ms: int,
+    wait_for_listing: bool = False,
 ):
     """
-    Concurrent test loop for a single trading symbol.
-    [Optimization] Added interval_ms parameter to introduce a delay after each cycle, enabling request throttling.
+    Concurrent test loop for a single trading symbol, run as a coroutine on the suite's event loop.
+    [Optimization] Added interval_ms parameter to throttle the cycles with a token bucket (see RateLimiter).
+    By default a position is closed as soon as its fill is confirmed. wait_for_listing additionally polls
+    get_positions until the ticket is listed before closing; those extra requests share the command channel
+    with the timed ones, so it is off unless asked for.
     """
     suite_name = "Concurrent Performance Test (Throttled)"
+    # Paces cycle starts interval_ms apart; time already spent in the round-trips counts towards the interval
+    limiter = RateLimiter(1000.0 / interval_ms if interval_ms > 0 else math.inf)
+    # Bound once instead of looked up on the client every iteration
+    buy = client.async_buy
+    close = client.async_close_position_by_ticket
+    wait_listed = client.async_wait_for_position_exists if wait_for_listing else None
     for i in range(iterations):
-        logging.info(f"[Thread {symbol}] Starting round {i+1}/{iterations}...")
+        await limiter.async_acquire()
+        logging.info("[Task %s] Starting round %d/%d...", symbol, i + 1, iterations)
 
         # Open position
-        case_name, ticket = f"{symbol} Open Position Loop {i+1}", None
-        response = client.buy(symbol=symbol, volume=0.01)
-        if response.get("status") == "success" and response.get("data", {}).get(
-            "ticket"
-        ):
-            ticket = response["data"]["ticket"]
+        case_name = f"{symbol} Open Position Loop {i+1}"
+        response = await buy(symbol=symbol, volume=0.01)
+        data = response.get("data") if response.get("status") == "success" else None
+        ticket = data.get("ticket") if data else None
+        if ticket:
             results_list.append(
-                {
-                    "Suite": suite_name,
-                    "Case": case_name,
-                    "Status": "PASS",
-                    "End-to-End Duration (ms)": get_duration(response),
-                    "Details": f"Ticket: {ticket}",
-                }
+                suite_name,
+                case_name,
+                True,
+                response.get("end_to_end_duration_ms", "N/A"),
+                f"Ticket: {ticket}",
             )
         else:
             results_list.append(
-                {
-                    "Suite": suite_name,
-                    "Case": case_name,
-                    "Status": "FAIL",
-                    "End-to-End Duration (ms)": get_duration(response),
-                    "Details": f"Failed to open position: {response.get('message', 'N/A')}",
-                }
+                suite_name,
+                case_name,
+                False,
+                response.get("end_to_end_duration_ms", "N/A"),
+                f"Failed to open position: {response.get('message', 'N/A')}",
             )
             # If opening position fails, no need to continue this cycle
-            time.sleep(interval_ms / 1000.0)
             continue
 
         # Close position
         if ticket:
-            time.sleep(0.2)  # Maintain a short, fixed interval between open and close
+            if wait_listed:
+                await wait_listed(ticket, timeout=2.0)
             case_name = f"{symbol} Close Position Loop {i+1}"
-            close_response = client.close_position_by_ticket(ticket=ticket)
-            status = "PASS" if close_response.get("status") == "success" else "FAIL"
+            close_response = await close(ticket=ticket)
+            passed = close_response.get("status") == "success"
             detail = (
                 "Position closed successfully"
-                if status == "PASS"
+                if passed
                 else f"Failed to close position: {close_response.get('message')}"
             )
             results_list.append(
-                {
-                    "Suite": suite_name,
-                    "Case": case_name,
-                    "Status": status,
-                    "End-to-End Duration (ms)": get_duration(close_response),
-                    "Details": detail,
-                }
+                suite_name,
+                case_name,
+                passed,
+                close_response.get("end_to_end_duration_ms", "N/A"),
+                detail,
             )
 
-        # [New] Wait after each complete open-close cycle according to the configured throttle interval
-        time.sleep(interval_ms / 1000.0)
+
+async def _run_cycles(
+    client: APIClient,
+    symbols_to_test: list,
+    iterations: int,
+    results_list: ResultsBuffer,
+    interval_ms: int,
+    wait_for_listing: bool,
+):
+    tasks = []
+    for symbol in symbols_to_test:
+        tasks.append(
+            asyncio.create_task(
+                trading_cycle(
+                    client,
+                    symbol,
+                    iterations,
+                    results_list,
+                    interval_ms,
+                    wait_for_listing,
+                )
+            )
+        )
+        logging.info(f"Started trading task for {symbol}...")
+    await asyncio.gather(*tasks)
 
 
-def run(client: APIClient, symbols_to_test: list, iterations: int, interval_ms: int):
+def _run_cycle_thread(
+    client: APIClient,
+    symbol: str,
+    iterations: int,
+    interval_ms: int,
+    wait_for_listing: bool,
+) -> ResultsBuffer:
+    """Drives one symbol's cycles on this worker thread's own event loop."""
+    # Each worker fills its own buffer; the five column appends of a row must not interleave
+    results = ResultsBuffer()
+    logging.info(f"Started trading loop thread for {symbol}...")
+    asyncio.run(
+        trading_cycle(
+            client, symbol, iterations, results, interval_ms, wait_for_listing
+        )
+    )
+    return results
+
+
+def run(
+    client: APIClient,
+    symbols_to_test: list,
+    iterations: int,
+    interval_ms: int,
+    wait_for_listing: bool = False,
+):
     """
     Runs the concurrent stress test suite.
-    [Optimization] Added interval_ms parameter, passed to each worker thread to control the request rate.
+    [Optimization] Added interval_ms parameter, passed to each symbol's task to control the request rate.
+    wait_for_listing makes each cycle poll for the opened position before closing it (see trading_cycle).
     """
     if not symbols_to_test:
         logging.warning(
@@ -93,16 +151,39 @@ def run(client: APIClient, symbols_to_test: list, iterations: int, interval_ms:
     logging.info(
         f"--- Concurrent Stress Test: Each symbol will execute {iterations} rounds of open-close cycles, with a cycle interval of {interval_ms} ms ---"
     )
-    threads, results_list = [], []
-    for symbol in symbols_to_test:
-        thread = threading.Thread(
-            target=trading_cycle,
-            args=(client, symbol, iterations, results_list, interval_ms),
+    results_list = ResultsBuffer()
+    # In REQ mode every request goes through the client's single request worker and req_lock,
+    # so per-symbol threads would only add contention; the fan-out needs pipelined requests
+    gil_disabled = _gil_disabled()
+    fan_out = gil_disabled and client.pipelined_requests
+    if gil_disabled and not fan_out:
+        logging.warning(
+            "GIL is disabled but pipelined_requests is off: REQ mode serializes all requests, "
+            "so the stress test runs every symbol on a single event loop."
+        )
+    if fan_out:
+        # Without the GIL, one event loop per symbol on its own thread spreads encode/decode across cores
+        with ThreadPoolExecutor(
+            max_workers=len(symbols_to_test), thread_name_prefix="stress"
+        ) as pool:
+            for buffer in pool.map(
+                lambda symbol: _run_cycle_thread(
+                    client, symbol, iterations, interval_ms, wait_for_listing
+                ),
+                symbols_to_test,
+            ):
+                results_list.extend(buffer)
+    else:
+        # Otherwise one event loop multiplexes all symbols instead of one OS thread per symbol
+        asyncio.run(
+            _run_cycles(
+                client,
+                symbols_to_test,
+                iterations,
+                results_list,
+                interval_ms,
+                wait_for_listing,
+            )
         )
-        threads.append(thread)
-        thread.start()
-        logging.info(f"Started trading thread for {symbol}...")
-    for thread in threads:
-        thread.join()
-    logging.info("--- All concurrent stress test threads have completed ---")
-    return results_list
+    logging.info("--- All concurrent stress test tasks have completed ---")
+    return results_list.to_records()
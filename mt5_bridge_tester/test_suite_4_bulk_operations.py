@@ -1,24 +1,17 @@
 # test_suite_4_bulk_operations.py
 import time
 import logging
-import json
 from mt5_bridge_client import APIClient
+from test_utils import ResultsBuffer
 
 
-def get_duration(response: dict) -> str:
-    """Safely extracts the end-to-end duration from the top-level fields of the response."""
-    return response.get("end_to_end_duration_ms", "N/A")
-
-
-def create_result(suite, case, status, duration, detail):
-    """A helper function to create a standard test result dictionary."""
-    return {
-        "Suite": suite,
-        "Case": case,
-        "Status": status,
-        "End-to-End Duration (ms)": duration,
-        "Details": detail,
-    }
+def _count_successes(requests: list, responses: list, symbol: str) -> int:
+    """Counts the requests for symbol that the server accepted."""
+    return sum(
+        1
+        for request, response in zip(requests, responses)
+        if request["symbol"] == symbol and response.get("status") == "success"
+    )
 
 
 def run(client: APIClient, symbols_to_test: list):
@@ -29,10 +22,10 @@ def run(client: APIClient, symbols_to_test: list):
 
     :param client: A connected APIClient instance.
     :param symbols_to_test: A list of symbols to be used for dynamic testing.
-    :return: A list of dictionaries containing test results.
+    :return: A list of TestResult rows, collected in a ResultsBuffer and materialized with to_records().
     """
     suite_name = "Bulk Management Operations"
-    results = []
+    results = ResultsBuffer()
 
     # --- [Optimization] Case 1: Close all positions for a specific symbol ---
     # Verification points: 1. API call is successful. 2. All positions of the target symbol are closed. 3. Positions of other symbols are not affected.
@@ -43,7 +36,7 @@ def run(client: APIClient, symbols_to_test: list):
     if len(symbols_to_test) < 2:
         msg = f"Skipped: '{case_name_base}' test requires at least 2 trading symbols in the configuration."
         logging.warning(msg)
-        results.append(create_result(suite_name, case_name_base, "PASS", "N/A", msg))
+        results.append(suite_name, case_name_base, True, "N/A", msg)
     else:
         target_symbol, other_symbol = symbols_to_test[0], symbols_to_test[1]
         case_name = f"{case_name_base} ({target_symbol})"
@@ -58,17 +51,22 @@ def run(client: APIClient, symbols_to_test: list):
             logging.info(
                 f"  [Setup] Creating a scenario for the test: Opening 2 {target_symbol} and 1 {other_symbol} positions..."
             )
-            client.buy(symbol=target_symbol, volume=0.01)
-            client.buy(symbol=other_symbol, volume=0.01)
-            client.buy(symbol=target_symbol, volume=0.01)
-            time.sleep(1.5)  # Wait for orders to be fully executed
-
-            positions_before = client.get_positions().get("data", [])
-            target_pos_count_before = len(
-                [p for p in positions_before if p.get("symbol") == target_symbol]
+            setup_orders = [
+                {"action": "buy", "symbol": target_symbol, "volume": 0.01},
+                {"action": "buy", "symbol": other_symbol, "volume": 0.01},
+                {"action": "buy", "symbol": target_symbol, "volume": 0.01},
+            ]
+            setup_responses = client.batch(setup_orders)
+            # Wait until the orders show up as positions
+            client.wait_for_positions(2, symbol=target_symbol, timeout=3.0)
+            client.wait_for_positions(1, symbol=other_symbol, timeout=3.0)
+
+            # The symbols were cleaned up first, so the successful setup orders are the current positions
+            target_pos_count_before = _count_successes(
+                setup_orders, setup_responses, target_symbol
             )
-            other_pos_count_before = len(
-                [p for p in positions_before if p.get("symbol") == other_symbol]
+            other_pos_count_before = _count_successes(
+                setup_orders, setup_responses, other_symbol
             )
             logging.info(
                 f"  [Verify] Setup complete. Current positions: {target_symbol} x{target_pos_count_before}, {other_symbol} x{other_pos_count_before}"
@@ -79,7 +77,7 @@ def run(client: APIClient, symbols_to_test: list):
                 f"  [Execute] Calling client.close_positions_by_symbol('{target_symbol}')"
             )
             response = client.close_positions_by_symbol(symbol=target_symbol)
-            duration = get_duration(response)
+            duration = response.get("end_to_end_duration_ms", "N/A")
 
             is_pass = False
             # [Optimization] Verification phase: Dual verification based on API response and final account state
@@ -110,33 +108,25 @@ def run(client: APIClient, symbols_to_test: list):
                         and len(other_remains) == other_pos_count_before
                     ):
                         detail = f"Successfully closed {target_pos_count_before} {target_symbol} positions, while {other_pos_count_before} {other_symbol} positions remained unaffected."
-                        results.append(
-                            create_result(
-                                suite_name, case_name, "PASS", duration, detail
-                            )
-                        )
+                        results.append(suite_name, case_name, True, duration, detail)
                         is_pass = True
                     else:
                         detail = f"Final account state is inconsistent. {target_symbol} remaining: {len(target_remains)} (expected 0), {other_symbol} remaining: {len(other_remains)} (expected {other_pos_count_before})."
                 else:
-                    detail = f"Could not verify final account state, get_positions responded abnormally: {json.dumps(pos_res_after)}"
+                    detail = f"Could not verify final account state, get_positions responded abnormally: {pos_res_after!r}"
             else:
-                detail = f"API call failed or the number of closed positions did not match. API response: {json.dumps(response)}"
+                detail = f"API call failed or the number of closed positions did not match. API response: {response!r}"
 
             if not is_pass:
-                results.append(
-                    create_result(suite_name, case_name, "FAIL", duration, detail)
-                )
+                results.append(suite_name, case_name, False, duration, detail)
 
         except Exception as e:
             results.append(
-                create_result(
-                    suite_name,
-                    case_name,
-                    "FAIL",
-                    "N/A",
-                    f"An unexpected exception occurred during test execution: {e}",
-                )
+                suite_name,
+                case_name,
+                False,
+                "N/A",
+                f"An unexpected exception occurred during test execution: {e}",
             )
         finally:
             logging.info(
@@ -150,13 +140,11 @@ def run(client: APIClient, symbols_to_test: list):
     logging.info(f"--- {suite_name}: {case_name} ---")
     if not symbols_to_test:
         results.append(
-            create_result(
-                suite_name,
-                case_name,
-                "PASS",
-                "N/A",
-                "Skipped: No test symbols configured.",
-            )
+            suite_name,
+            case_name,
+            True,
+            "N/A",
+            "Skipped: No test symbols configured.",
         )
     else:
         duration = "N/A"
@@ -164,9 +152,13 @@ def run(client: APIClient, symbols_to_test: list):
             logging.info(
                 f"  [Setup] Opening 1 position for each of the {len(symbols_to_test)} symbols..."
             )
-            for symbol in symbols_to_test:
-                client.buy(symbol=symbol, volume=0.01)
-            time.sleep(1.5)
+            client.batch(
+                [
+                    {"action": "buy", "symbol": symbol, "volume": 0.01}
+                    for symbol in symbols_to_test
+                ]
+            )
+            client.wait_for_positions(len(symbols_to_test), timeout=3.0)
 
             positions_before = client.get_positions().get("data", [])
             pos_count_before = len(positions_before)
@@ -176,37 +168,29 @@ def run(client: APIClient, symbols_to_test: list):
 
             logging.info("  [Execute] Calling client.close_all_positions()")
             response = client.close_all_positions()
-            duration = get_duration(response)
+            duration = response.get("end_to_end_duration_ms", "N/A")
 
             if (
                 response.get("status") == "success"
                 and response.get("data", {}).get("closed_count", 0) == pos_count_before
             ):
                 results.append(
-                    create_result(
-                        suite_name,
-                        case_name,
-                        "PASS",
-                        duration,
-                        f"API call successful, correctly closed all {pos_count_before} positions.",
-                    )
+                    suite_name,
+                    case_name,
+                    True,
+                    duration,
+                    f"API call successful, correctly closed all {pos_count_before} positions.",
                 )
             else:
                 results.append(
-                    create_result(
-                        suite_name,
-                        case_name,
-                        "FAIL",
-                        duration,
-                        f"API call failed or number of closed positions did not match: {json.dumps(response)}",
-                    )
+                    suite_name,
+                    case_name,
+                    False,
+                    duration,
+                    f"API call failed or number of closed positions did not match: {response!r}",
                 )
         except Exception as e:
-            results.append(
-                create_result(
-                    suite_name, case_name, "FAIL", "N/A", f"Test exception: {e}"
-                )
-            )
+            results.append(suite_name, case_name, False, "N/A", f"Test exception: {e}")
         finally:
             client.close_all_positions()  # Ensure cleanup
             time.sleep(1)
@@ -218,7 +202,7 @@ def run(client: APIClient, symbols_to_test: list):
     if len(symbols_to_test) < 2:
         msg = f"Skipped: '{case_name_base}' test requires at least 2 trading symbols in the configuration."
         logging.warning(msg)
-        results.append(create_result(suite_name, case_name_base, "PASS", "N/A", msg))
+        results.append(suite_name, case_name_base, True, "N/A", msg)
     else:
         target_symbol, other_symbol = symbols_to_test[0], symbols_to_test[1]
         case_name = f"{case_name_base} ({target_symbol})"
@@ -235,24 +219,51 @@ def run(client: APIClient, symbols_to_test: list):
                 f"  [Setup] Setting up 2 pending orders for {target_symbol}, and 1 for {other_symbol}..."
             )
             # Simplify price fetching, assume success
-            target_ask = client.get_price(symbol=target_symbol)["data"]["ask"]
-            other_ask = client.get_price(symbol=other_symbol)["data"]["ask"]
-
-            client.buy_limit(symbol=target_symbol, volume=0.01, price=target_ask * 0.9)
-            client.buy_limit(symbol=target_symbol, volume=0.01, price=target_ask * 0.95)
-            client.buy_limit(symbol=other_symbol, volume=0.01, price=other_ask * 0.9)
+            target_price, other_price = client.batch(
+                [
+                    {"action": "get_price", "symbol": target_symbol},
+                    {"action": "get_price", "symbol": other_symbol},
+                ]
+            )
+            target_ask = target_price["data"]["ask"]
+            other_ask = other_price["data"]["ask"]
+
+            setup_orders = [
+                {
+                    "action": "buy_limit",
+                    "symbol": target_symbol,
+                    "volume": 0.01,
+                    "price": target_ask * 0.9,
+                },
+                {
+                    "action": "buy_limit",
+                    "symbol": target_symbol,
+                    "volume": 0.01,
+                    "price": target_ask * 0.95,
+                },
+                {
+                    "action": "buy_limit",
+                    "symbol": other_symbol,
+                    "volume": 0.01,
+                    "price": other_ask * 0.9,
+                },
+            ]
+            setup_responses = client.batch(setup_orders)
             time.sleep(1.5)
 
-            orders_before = client.get_pending_orders().get("data", [])
-            target_orders_count = len(
-                [o for o in orders_before if o.get("symbol") == target_symbol]
+            # Pending orders were cleaned up first, so the accepted setup orders are the current ones
+            target_orders_count = _count_successes(
+                setup_orders, setup_responses, target_symbol
+            )
+            other_orders_count = _count_successes(
+                setup_orders, setup_responses, other_symbol
             )
 
             logging.info(
                 f"  [Execute] Calling client.cancel_symbol_pending_orders('{target_symbol}')"
             )
             response = client.cancel_symbol_pending_orders(symbol=target_symbol)
-            duration = get_duration(response)
+            duration = response.get("end_to_end_duration_ms", "N/A")
 
             is_pass = False
             if (
@@ -271,28 +282,20 @@ def run(client: APIClient, symbols_to_test: list):
                     o for o in orders_after if o.get("symbol") == other_symbol
                 ]
 
-                if not target_remains and len(other_remains) == 1:
+                if not target_remains and len(other_remains) == other_orders_count:
                     detail = f"Successfully cancelled {target_orders_count} {target_symbol} pending orders, {other_symbol} was not affected."
-                    results.append(
-                        create_result(suite_name, case_name, "PASS", duration, detail)
-                    )
+                    results.append(suite_name, case_name, True, duration, detail)
                     is_pass = True
                 else:
                     detail = f"Final pending order state is inconsistent. {target_symbol} remaining: {len(target_remains)}, {other_symbol} remaining: {len(other_remains)}"
             else:
-                detail = f"API call failed or number of cancelled orders did not match: {json.dumps(response)}"
+                detail = f"API call failed or number of cancelled orders did not match: {response!r}"
 
             if not is_pass:
-                results.append(
-                    create_result(suite_name, case_name, "FAIL", duration, detail)
-                )
+                results.append(suite_name, case_name, False, duration, detail)
 
         except Exception as e:
-            results.append(
-                create_result(
-                    suite_name, case_name, "FAIL", "N/A", f"Test exception: {e}"
-                )
-            )
+            results.append(suite_name, case_name, False, "N/A", f"Test exception: {e}")
         finally:
             logging.info("  [Cleanup] Cancelling all remaining pending orders...")
             client.cancel_all_pending_orders()
@@ -303,13 +306,11 @@ def run(client: APIClient, symbols_to_test: list):
     logging.info(f"--- {suite_name}: {case_name} ---")
     if not symbols_to_test:
         results.append(
-            create_result(
-                suite_name,
-                case_name,
-                "PASS",
-                "N/A",
-                "Skipped: No test symbols configured.",
-            )
+            suite_name,
+            case_name,
+            True,
+            "N/A",
+            "Skipped: No test symbols configured.",
         )
     else:
         duration = "N/A"
@@ -317,12 +318,24 @@ def run(client: APIClient, symbols_to_test: list):
             logging.info(
                 f"  [Setup] Setting 1 pending order for each of the {len(symbols_to_test)} symbols..."
             )
-            for symbol in symbols_to_test:
-                price_res = client.get_price(symbol=symbol)
-                if price_res.get("status") == "success":
-                    client.buy_limit(
-                        symbol=symbol, volume=0.01, price=price_res["data"]["ask"] * 0.9
-                    )
+            price_responses = client.batch(
+                [
+                    {"action": "get_price", "symbol": symbol}
+                    for symbol in symbols_to_test
+                ]
+            )
+            client.batch(
+                [
+                    {
+                        "action": "buy_limit",
+                        "symbol": symbol,
+                        "volume": 0.01,
+                        "price": price_res["data"]["ask"] * 0.9,
+                    }
+                    for symbol, price_res in zip(symbols_to_test, price_responses)
+                    if price_res.get("status") == "success"
+                ]
+            )
             time.sleep(1.5)
 
             orders_before = client.get_pending_orders().get("data", [])
@@ -333,7 +346,7 @@ def run(client: APIClient, symbols_to_test: list):
 
             logging.info("  [Execute] Calling client.cancel_all_pending_orders()")
             response = client.cancel_all_pending_orders()
-            duration = get_duration(response)
+            duration = response.get("end_to_end_duration_ms", "N/A")
 
             if (
                 response.get("status") == "success"
@@ -341,32 +354,24 @@ def run(client: APIClient, symbols_to_test: list):
                 == orders_count_before
             ):
                 results.append(
-                    create_result(
-                        suite_name,
-                        case_name,
-                        "PASS",
-                        duration,
-                        f"Successfully cancelled all {orders_count_before} pending orders.",
-                    )
+                    suite_name,
+                    case_name,
+                    True,
+                    duration,
+                    f"Successfully cancelled all {orders_count_before} pending orders.",
                 )
             else:
                 results.append(
-                    create_result(
-                        suite_name,
-                        case_name,
-                        "FAIL",
-                        duration,
-                        f"API call failed or number of cancelled orders did not match: {json.dumps(response)}",
-                    )
+                    suite_name,
+                    case_name,
+                    False,
+                    duration,
+                    f"API call failed or number of cancelled orders did not match: {response!r}",
                 )
         except Exception as e:
-            results.append(
-                create_result(
-                    suite_name, case_name, "FAIL", "N/A", f"Test exception: {e}"
-                )
-            )
+            results.append(suite_name, case_name, False, "N/A", f"Test exception: {e}")
         finally:
             client.cancel_all_pending_orders()  # Ensure cleanup
             time.sleep(1)
 
-    return results
+    return results.to_records()
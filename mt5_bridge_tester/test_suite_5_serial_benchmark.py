@@ -1,21 +1,103 @@
 # test_suite_5_serial_benchmark.py
-import time
+import asyncio
 import logging
 from mt5_bridge_client import APIClient
+from test_utils import ResultsBuffer
 
 
-def get_duration(response: dict) -> str:
-    """Safely extracts the end-to-end duration from the top-level fields of the response."""
-    return response.get("end_to_end_duration_ms", "N/A")
+async def _symbol_cycles(
+    client: APIClient,
+    symbol: str,
+    iterations: int,
+    interval_ms: int,
+    suite_name: str,
+    results_list: ResultsBuffer,
+):
+    """Runs the open-close rounds of one symbol; rounds of the same symbol always stay strictly sequential."""
+    open_then_close = client.async_open_then_close
+    interval_s = interval_ms / 1000.0
+    for i in range(iterations):
+        logging.info("[Serial %s] Starting round %d/%d...", symbol, i + 1, iterations)
 
+        # Open and close in one call: the close is sent as soon as the buy reply confirms the fill
+        result = await open_then_close(symbol=symbol, volume=0.01)
+        response, ticket = result["open"], result["ticket"]
+        case_name = f"{symbol} Open Position Loop {i+1}"
+        if ticket:
+            results_list.append(
+                suite_name,
+                case_name,
+                True,
+                result["durations"]["open"],
+                f"Ticket: {ticket}",
+            )
+        else:
+            results_list.append(
+                suite_name,
+                case_name,
+                False,
+                result["durations"]["open"],
+                f"Failed to open position: {response.get('message', 'N/A')}",
+            )
+            await asyncio.sleep(interval_s)
+            continue  # Skip the rest of this iteration if opening position failed
 
-def run(client: APIClient, symbols_to_test: list, iterations: int, interval_ms: int):
+        # Close position
+        close_response = result["close"]
+        case_name = f"{symbol} Close Position Loop {i+1}"
+        passed = close_response.get("status") == "success"
+        detail = (
+            "Position closed successfully"
+            if passed
+            else f"Failed to close position: {close_response.get('message')}"
+        )
+        results_list.append(
+            suite_name, case_name, passed, result["durations"]["close"], detail
+        )
+
+        # Wait for the specified interval after each complete open-close cycle
+        await asyncio.sleep(interval_s)
+
+
+async def _run_symbols(
+    client: APIClient,
+    symbols_to_test: list,
+    iterations: int,
+    interval_ms: int,
+    suite_name: str,
+    results_list: ResultsBuffer,
+    truly_serial: bool,
+):
+    if truly_serial:
+        for symbol in symbols_to_test:
+            await _symbol_cycles(
+                client, symbol, iterations, interval_ms, suite_name, results_list
+            )
+    else:
+        await asyncio.gather(
+            *[
+                _symbol_cycles(
+                    client, symbol, iterations, interval_ms, suite_name, results_list
+                )
+                for symbol in symbols_to_test
+            ]
+        )
+
+
+def run(
+    client: APIClient,
+    symbols_to_test: list,
+    iterations: int,
+    interval_ms: int,
+    truly_serial: bool = False,
+):
     """
     Executes the serial benchmark test suite.
 
-    This suite performs an "open-close" loop for a specified number of iterations for each symbol sequentially
-    in a single thread. It aims to establish a performance baseline without concurrency pressure,
-    for comparative analysis with the results of concurrent tests.
+    Each symbol performs its "open-close" loop for a specified number of iterations strictly in sequence.
+    By default the symbols themselves run side by side on one event loop, so the fixed waits of one symbol
+    overlap with the requests of another; pass truly_serial=True (--truly-serial) to run the symbols one
+    after another as well, which gives the original baseline without any concurrency pressure.
     """
     if not symbols_to_test:
         logging.warning(
@@ -24,67 +106,20 @@ def run(client: APIClient, symbols_to_test: list, iterations: int, interval_ms:
         return []
 
     suite_name = "Serial Benchmark Test"
-    results_list = []
+    results_list = ResultsBuffer()
     logging.info(
         f"--- {suite_name}: Each symbol will serially execute {iterations} rounds of open-close cycles, with an interval of {interval_ms} ms ---"
     )
-
-    for symbol in symbols_to_test:
-        for i in range(iterations):
-            logging.info(f"[Serial {symbol}] Starting round {i+1}/{iterations}...")
-
-            # Open position
-            case_name, ticket = f"{symbol} Open Position Loop {i+1}", None
-            response = client.buy(symbol=symbol, volume=0.01)
-            if response.get("status") == "success" and response.get("data", {}).get(
-                "ticket"
-            ):
-                ticket = response["data"]["ticket"]
-                results_list.append(
-                    {
-                        "Suite": suite_name,
-                        "Case": case_name,
-                        "Status": "PASS",
-                        "End-to-End Duration (ms)": get_duration(response),
-                        "Details": f"Ticket: {ticket}",
-                    }
-                )
-            else:
-                results_list.append(
-                    {
-                        "Suite": suite_name,
-                        "Case": case_name,
-                        "Status": "FAIL",
-                        "End-to-End Duration (ms)": get_duration(response),
-                        "Details": f"Failed to open position: {response.get('message', 'N/A')}",
-                    }
-                )
-                time.sleep(interval_ms / 1000.0)
-                continue  # Skip the rest of this iteration if opening position failed
-
-            # Close position
-            if ticket:
-                time.sleep(0.2)  # A short delay between opening and closing
-                case_name = f"{symbol} Close Position Loop {i+1}"
-                close_response = client.close_position_by_ticket(ticket=ticket)
-                status = "PASS" if close_response.get("status") == "success" else "FAIL"
-                detail = (
-                    "Position closed successfully"
-                    if status == "PASS"
-                    else f"Failed to close position: {close_response.get('message')}"
-                )
-                results_list.append(
-                    {
-                        "Suite": suite_name,
-                        "Case": case_name,
-                        "Status": status,
-                        "End-to-End Duration (ms)": get_duration(close_response),
-                        "Details": detail,
-                    }
-                )
-
-            # Wait for the specified interval after each complete open-close cycle
-            time.sleep(interval_ms / 1000.0)
-
+    asyncio.run(
+        _run_symbols(
+            client,
+            symbols_to_test,
+            iterations,
+            interval_ms,
+            suite_name,
+            results_list,
+            truly_serial,
+        )
+    )
     logging.info(f"--- {suite_name} execution completed ---")
-    return results_list
+    return results_list.to_records()
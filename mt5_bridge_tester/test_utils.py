@@ -1,73 +1,396 @@
 # test_utils.py
+from __future__ import annotations
 
-import pandas as pd
+import asyncio
+import functools
+import importlib.util
+import math
+import sys
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple
+import numpy as np
 
+if TYPE_CHECKING:
+    # Only needed for annotations; results_to_df and summarize import pandas when a report is actually built
+    import pandas as pd
 
-def record_result(
-    suite_name: str,
+try:
+    from numba import njit
+except ImportError:  # numba is optional, summarize then aggregates with numpy
+    njit = None
+
+# Results store the status as a bool; STATUS maps it to the report label when displayed:
+# STATUS[False] == "FAIL", STATUS[True] == "PASS"
+STATUS = (sys.intern("FAIL"), sys.intern("PASS"))
+_STATUS_ARRAY = np.array(STATUS, dtype=object)
+# Interned constants for the response fields _record_response compares against or falls back to.
+# Parsed replies are not guaranteed to carry interned strings, so the status check is an identity
+# test with an equality fallback rather than identity alone.
+_SUCCESS = sys.intern("success")
+_OK = sys.intern("OK")
+_NA = sys.intern("N/A")
+_NO_MSG = sys.intern("No message")
+# Column order of the report
+REPORT_COLUMNS = ["Suite", "Case", "Status", "End-to-End Duration (ms)", "Details"]
+
+
+class TestResult(NamedTuple):
+    """
+    One recorded test case, as a five-field tuple instead of a five-key dict. Status is True for a pass.
+    Being a tuple it has no per-instance __dict__, and results_to_df transposes a list of them into columns with zip(*results).
+    """
+
+    # Not a test class, even though pytest collects names starting with "Test"
+    __test__ = False
+
+    Suite: str
+    Case: str
+    Status: bool
+    duration_ms: object
+    Details: str
+
+
+def _duration_ms(value) -> float:
+    """Duration as a float; "N/A" and other non-numeric values become NaN."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def results_to_df(results: list) -> pd.DataFrame:
+    """
+    Builds the report DataFrame from TestResult rows, transposing the tuples into columns in one zip.
+    Suite only takes a handful of distinct values, so it is stored as a categorical; Status is a bool column
+    (see status_labels) and the duration is written into a pre-sized float64 array (NaN for "N/A") instead of
+    an inferred object column. With pyarrow installed, Case and Details are pyarrow-backed string columns
+    (one contiguous buffer per column instead of one Python object per cell).
+    """
+    # Imported here so that importing test_utils alone does not load pandas
+    import pandas as pd
+
+    # pyarrow is optional; without it the string columns stay object columns
+    if importlib.util.find_spec("pyarrow") is not None:
+        string_dtype = "string[pyarrow]"
+    else:
+        string_dtype = object
+
+    suites, cases, statuses, durations, details = (
+        zip(*results) if results else ((),) * len(TestResult._fields)
+    )
+    return pd.DataFrame(
+        {
+            "Suite": pd.Categorical(suites),
+            "Case": pd.array(cases, dtype=string_dtype),
+            "Status": np.fromiter(statuses, dtype=bool, count=len(results)),
+            "End-to-End Duration (ms)": np.fromiter(
+                map(_duration_ms, durations), dtype=np.float64, count=len(results)
+            ),
+            # Default details are formatted here, once, as the column is built
+            "Details": pd.array(list(map(str, details)), dtype=string_dtype),
+        },
+        columns=REPORT_COLUMNS,
+        copy=False,
+    )
+
+
+def _suite_totals(suite_ids, passed, durations, n_suites):
+    """Per-suite case count, pass count, duration sum and number of timed cases, in one pass over the rows."""
+    counts = np.zeros(n_suites, dtype=np.int64)
+    passes = np.zeros(n_suites, dtype=np.int64)
+    duration_sums = np.zeros(n_suites, dtype=np.float64)
+    timed = np.zeros(n_suites, dtype=np.int64)
+    for i in range(suite_ids.shape[0]):
+        suite = suite_ids[i]
+        counts[suite] += 1
+        if passed[i]:
+            passes[suite] += 1
+        if not np.isnan(durations[i]):
+            duration_sums[suite] += durations[i]
+            timed[suite] += 1
+    return counts, passes, duration_sums, timed
+
+
+if njit is not None:
+    _suite_totals = njit(nogil=True, cache=True)(_suite_totals)
+else:
+
+    def _suite_totals(suite_ids, passed, durations, n_suites):
+        valid = ~np.isnan(durations)
+        return (
+            np.bincount(suite_ids, minlength=n_suites),
+            np.bincount(suite_ids, weights=passed, minlength=n_suites).astype(np.int64),
+            np.bincount(suite_ids[valid], weights=durations[valid], minlength=n_suites),
+            np.bincount(suite_ids[valid], minlength=n_suites),
+        )
+
+
+def summarize(results: list) -> pd.DataFrame:
+    """
+    Per-suite summary of TestResult rows: cases, passes, failures and the mean end-to-end duration.
+    Suite names are mapped to small integer ids and the totals are accumulated over typed arrays
+    (compiled with numba when it is installed) instead of a groupby on string keys.
+    """
+    import pandas as pd
+
+    suite_ids = {}
+    ids = np.fromiter(
+        (suite_ids.setdefault(r.Suite, len(suite_ids)) for r in results),
+        dtype=np.intp,
+        count=len(results),
+    )
+    passed = np.fromiter((r.Status for r in results), dtype=bool, count=len(results))
+    durations = np.fromiter(
+        (_duration_ms(r.duration_ms) for r in results),
+        dtype=np.float64,
+        count=len(results),
+    )
+    counts, passes, duration_sums, timed = _suite_totals(
+        ids, passed, durations, len(suite_ids)
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_durations = duration_sums / timed
+    return pd.DataFrame(
+        {
+            "Cases": counts,
+            "Passed": passes,
+            "Failed": counts - passes,
+            "Mean Duration (ms)": np.where(timed > 0, mean_durations, np.nan),
+        },
+        index=pd.Index(list(suite_ids), name="Suite"),
+    )
+
+
+class _LazyDetail:
+    """Default "Success: <data>" / "Failure: <message>" detail, formatted only when the report displays it."""
+
+    __slots__ = ("prefix", "obj")
+
+    def __init__(self, prefix: str, obj):
+        self.prefix = prefix
+        self.obj = obj
+
+    def __str__(self):
+        return f"{self.prefix}: {self.obj}"
+
+    __repr__ = __str__
+
+
+def status_labels(passed) -> np.ndarray:
+    """Maps a boolean Status column to its PASS/FAIL labels for display."""
+    return _STATUS_ARRAY[np.asarray(passed, dtype=bool).astype(np.intp)]
+
+
+def _record_response(
+    suite: str,
     case_name: str,
     response: dict,
+    /,
     success_condition: bool = None,
     detail_on_pass: str = "",
     detail_on_fail: str = "",
 ):
+    """Body of the recorders returned by make_recorder; suite must already be interned."""
+    # All response fields are fetched in one pass up front; the branches below only pick among them
+    rget = response.get
+    status, data, message, duration = (
+        rget("status"),
+        rget("data", _OK),
+        rget("message", _NO_MSG),
+        rget("end_to_end_duration_ms", _NA),
+    )
+    if success_condition is None:
+        is_success = status is _SUCCESS or status == _SUCCESS
+    else:
+        is_success = bool(success_condition)
+
+    # The default detail is only used when no custom one was given, and only formatted when displayed
+    if is_success:
+        detail = detail_on_pass or _LazyDetail("Success", data)
+    else:
+        detail = detail_on_fail or _LazyDetail("Failure", message)
+
+    return TestResult(suite, case_name, is_success, duration, detail)
+
+
+def make_recorder(suite_name: str):
     """
-    A helper function to uniformly generate and record test results.
+    Returns the function that turns an APIClient response into a TestResult of the given suite.
+    The interned suite name is bound in a partial, so each call neither passes nor interns it
+    and no extra Python frame is added.
+
+    The recorder is called as record(case_name, response, success_condition=None, detail_on_pass="", detail_on_fail=""):
 
-    :param suite_name: The name of the test suite.
     :param case_name: The name of the test case.
     :param response: The raw response dictionary from the APIClient.
     :param success_condition: Optional, a boolean value to override the default success check (response.get("status") == "success").
     :param detail_on_pass: Optional, custom detail to display on success.
     :param detail_on_fail: Optional, custom detail to display on failure.
-    :return: A test result dictionary in a standard format.
+
+    case_name and response are positional-only, so the common positional call skips keyword matching.
     """
-    if success_condition is None:
-        is_success = response.get("status") == "success"
-    else:
-        is_success = success_condition
+    return functools.partial(_record_response, sys.intern(suite_name))
 
-    status = "PASS" if is_success else "FAIL"
 
-    if is_success:
-        detail = (
-            detail_on_pass
-            if detail_on_pass
-            else f"Success: {response.get('data', 'OK')}"
+def record_df_results_batch(
+    suite_name: str,
+    case_names,
+    durations_ms,
+    success_mask,
+    details_on_pass,
+    details_on_fail,
+) -> list:
+    """
+    Records several cases of functions that return a DataFrame. The DataFrames themselves are not passed in,
+    so they can be released as soon as the details are formatted; the detail column of all cases is selected
+    with one boolean mask instead of one function call per case.
+    """
+    success_mask = np.asarray(success_mask, dtype=bool)
+    details = np.where(
+        success_mask,
+        np.asarray(details_on_pass, dtype=object),
+        np.asarray(details_on_fail, dtype=object),
+    )
+    suite_name = sys.intern(suite_name)
+    return list(
+        map(
+            TestResult,
+            [suite_name] * len(success_mask),
+            case_names,
+            success_mask.tolist(),
+            durations_ms,
+            details.tolist(),
         )
-    else:
-        detail = (
-            detail_on_fail
-            if detail_on_fail
-            else f"Failure: {response.get('message', 'No message')}"
+    )
+
+
+class ResultsBuffer:
+    """
+    Column-wise (one deque per field) store for test results, so a long stress run does not build one dict per case.
+    Rows are only materialized as TestResult objects by to_records().
+    """
+
+    __slots__ = ("suite", "case", "status", "duration", "details")
+
+    def __init__(self):
+        # deques append in O(1) without the list's resize-and-copy at growth points
+        self.suite = deque()
+        self.case = deque()
+        self.status = deque()
+        self.duration = deque()
+        self.details = deque()
+
+    def __len__(self):
+        return len(self.case)
+
+    def append(self, suite_name: str, case_name: str, passed: bool, duration, detail):
+        self.suite.append(sys.intern(suite_name))
+        self.case.append(case_name)
+        self.status.append(passed)
+        self.duration.append(duration)
+        self.details.append(detail)
+
+    def extend(self, other: "ResultsBuffer"):
+        self.suite.extend(other.suite)
+        self.case.extend(other.case)
+        self.status.extend(other.status)
+        self.duration.extend(other.duration)
+        self.details.extend(other.details)
+
+    def to_records(self) -> list:
+        """Returns the results as the list of TestResult rows expected by the report."""
+        # _make builds each row with tuple.__new__ directly instead of going through the generated __new__
+        return list(
+            map(
+                TestResult._make,
+                zip(self.suite, self.case, self.status, self.duration, self.details),
+            )
+        )
+
+
+class StreamingRecorder:
+    """
+    Writes each test result as one JSON line to a buffered file, keyed by the report's column names.
+    Use it as a context manager (or call close()) so the buffer is flushed.
+    """
+
+    __slots__ = ("_writer", "_dumps")
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        # Imported here so that importing test_utils alone loads neither JSON library
+        try:
+            import orjson
+        except ImportError:  # orjson is optional, fall back to the stdlib json module
+            import json
+
+            def dumps(obj) -> bytes:
+                return json.dumps(obj).encode("utf-8")
+
+            self._dumps = dumps
+        else:
+            self._dumps = orjson.dumps
+        self._writer = open(path, "wb", buffering=buffer_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, result: TestResult):
+        suite, case, passed, duration, detail = result
+        self._writer.write(
+            self._dumps(
+                dict(zip(REPORT_COLUMNS, (suite, case, passed, duration, str(detail))))
+            )
         )
+        self._writer.write(b"\n")
 
-    return {
-        "Suite": suite_name,
-        "Case": case_name,
-        "Status": status,
-        "End-to-End Duration (ms)": response.get("end_to_end_duration_ms", "N/A"),
-        "Details": detail,
-    }
+    def extend(self, results):
+        for result in results:
+            self.add(result)
 
+    def flush(self):
+        self._writer.flush()
 
-def record_df_result(
-    suite_name: str,
-    case_name: str,
-    df: pd.DataFrame,
-    duration_ms: str,
-    success_condition: bool,
-    detail_on_pass: str,
-    detail_on_fail: str,
-):
-    """A helper function specifically for recording test results of functions that return a DataFrame."""
-    status = "PASS" if success_condition else "FAIL"
-    detail = detail_on_pass if success_condition else detail_on_fail
-
-    return {
-        "Suite": suite_name,
-        "Case": case_name,
-        "Status": status,
-        "End-to-End Duration (ms)": duration_ms,
-        "Details": detail,
-    }
+    def close(self):
+        self._writer.close()
+
+
+class RateLimiter:
+    """
+    Monotonic-clock token bucket. acquire() only waits for the part of the interval that has not already
+    elapsed, so a slow round-trip is not followed by a full fixed sleep. Safe to share between threads.
+    """
+
+    def __init__(self, rate_per_s: float, burst: int = 1):
+        self._rate = rate_per_s
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes one token and returns how long the caller has to wait before using it."""
+        if self._rate == math.inf:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._last) * self._rate
+            )
+            self._last = now
+            self._tokens -= 1.0
+            return -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def async_acquire(self):
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)